@@ -1,28 +1,13 @@
 # Libraries
 import streamlit as st
-from PIL import Image
+from monitoring.logos import sprite
 
 # Layout
 st.set_page_config(page_title='Cross Chain Monitoring Tool', page_icon=':bar_chart:', layout='wide')
 st.title('Cross Chain Monitoring Tool')
 
 # Content
-c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, c11, c12, c13, c14, c15 = st.columns(15)
-c1.image(Image.open('Images/ethereum-logo.png'))
-c2.image(Image.open('Images/bsc-logo.png'))
-c3.image(Image.open('Images/polygon-logo.png'))
-c4.image(Image.open('Images/solana-logo.png'))
-c5.image(Image.open('Images/avalanche-logo.png'))
-c6.image(Image.open('Images/cosmos-logo.png'))
-c7.image(Image.open('Images/algorand-logo.png'))
-c8.image(Image.open('Images/near-logo.png'))
-c9.image(Image.open('Images/flow-logo.png'))
-c10.image(Image.open('Images/thorchain-logo.png'))
-c11.image(Image.open('Images/osmosis-logo.png'))
-c12.image(Image.open('Images/gnosis-logo.png'))
-c13.image(Image.open('Images/optimism-logo.png'))
-c14.image(Image.open('Images/arbitrum-logo.png'))
-c15.image(Image.open('Images/axelar-logo.png'))
+st.image(sprite(), width='stretch')
 
 st.write("")
 st.write("")
@@ -42,8 +27,8 @@ st.write(
     narrow/expand the comparison. By selecting a single blockchain, you can observe a deep dive
     into that particular network.
 
-    All values for amounts, prices, and volumes are in **U.S. dollars** and the time frequency of the
-    analysis was limited to the last **30 days**.
+    All values for amounts, prices, and volumes are in **U.S. dollars**. Each query covers the last **30 days**,
+    and the daily history grows beyond that with every daily refresh as the new days are stored locally.
     """
 )
 
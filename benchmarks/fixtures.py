@@ -0,0 +1,102 @@
+# Libraries
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from monitoring import snapshots
+from monitoring.data import QUERIES
+
+# Where the benchmarks read the snapshots from: a copy of them completed with fixtures
+FIXTURE_DIR = os.path.join(tempfile.gettempdir(), 'cross_chain_monitoring_benchmark')
+
+# Integer metrics; the others are amounts in USD
+_COUNTS = ('Transfers', 'Swaps', 'Swappers', 'Sales', 'Buyers', 'NFTs')
+
+
+def _rows(chains, column, prefix, count, dates=None):
+    # count labels per blockchain, e.g. 'Asset Eth 0', over every date when given
+    rows = pd.DataFrame(
+        [(chain, f'{prefix} {chain[:3]} {number}') for chain in chains for number in range(count)],
+        columns=['Blockchain', column]
+    )
+    if dates is not None:
+        rows = rows.merge(pd.DataFrame({'Date': dates}), how='cross')[['Blockchain', 'Date', column]]
+    return rows
+
+
+def _metrics(rows, metrics, rng):
+    # Heavy-tailed values, as the top users, assets and collections of the real datasets are
+    for metric in metrics:
+        values = rng.lognormal(mean=6, sigma=2, size=len(rows))
+        rows[metric] = np.ceil(values).astype(int) if metric in _COUNTS else values.round(2)
+    return rows
+
+
+def _swaps(rows, rng):
+    rows = _metrics(rows, ['Swaps', 'Swappers', 'Volume'], rng)
+    rows['AmountAverage'] = rows['Volume'] / rows['Swaps']
+    rows['AmountMedian'] = rows['AmountAverage'] * rng.uniform(0.1, 1, size=len(rows))
+    return rows
+
+
+def _nfts(rows, rng):
+    rows = _metrics(rows, ['Sales', 'Buyers', 'NFTs', 'Volume'], rng)
+    rows['PriceAverage'] = rows['Volume'] / rows['Sales']
+    rows['PriceMedian'] = rows['PriceAverage'] * rng.uniform(0.1, 1, size=len(rows))
+    rows['PriceMax'] = rows['PriceAverage'] * rng.uniform(1, 20, size=len(rows))
+    rows['PriceFloor'] = rows['PriceMedian'] * rng.uniform(0, 1, size=len(rows))
+    return rows
+
+
+# Synthetic stand-ins for the datasets that have no snapshot in Data/, with the columns of the query results:
+# dataset -> function of (blockchains, dates, random generator) returning the frame
+FIXTURES = {
+    ('Transactions', 'Fee Payers'): lambda chains, dates, rng: _metrics(_rows(chains, 'User', '0x', 10), ['Fees'], rng),
+    ('Transfers', 'Transferring Users'): lambda chains, dates, rng: _metrics(
+        _rows(chains, 'User', '0x', 10), ['Transfers', 'Volume'], rng
+    ),
+    ('Transfers', 'Wallet Types'): lambda chains, dates, rng: _metrics(
+        _rows(chains, 'Wallet', 'Wallet', 3), ['Volume', 'Transfers', 'Users'], rng
+    ),
+    ('Swaps', 'Assets Overview'): lambda chains, dates, rng: _swaps(_rows(chains, 'Asset', 'Asset', 40), rng),
+    ('Swaps', 'Assets Daily'): lambda chains, dates, rng: _swaps(_rows(chains, 'Asset', 'Asset', 10, dates), rng),
+    ('NFTs', 'Collections Overview'): lambda chains, dates, rng: _nfts(_rows(chains, 'Collection', 'Collection', 200), rng),
+    ('NFTs', 'Collections Daily'): lambda chains, dates, rng: _nfts(
+        _rows(chains, 'Collection', 'Collection', 20, dates), rng
+    ),
+}
+
+
+def prepare(source, target, seed=0):
+    # Fills the target directory with a snapshot of every dataset: a copy of the one in the source directory,
+    # or a fixture over the blockchains and dates of the recorded ones. Returns the datasets that are fixtures.
+    os.makedirs(target, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    overview = pd.read_csv(os.path.join(source, 'transactions_overview.csv'))
+    daily = pd.read_csv(os.path.join(source, 'transfers_daily.csv'))
+    chains, dates = sorted(overview['Blockchain'].unique()), sorted(daily['Date'].unique())
+
+    synthetic = []
+    for dataset in QUERIES:
+        name = os.path.basename(snapshots.path(*dataset))
+        if os.path.exists(os.path.join(source, name)):
+            shutil.copyfile(os.path.join(source, name), os.path.join(target, name))
+        elif dataset in FIXTURES:
+            FIXTURES[dataset](chains, dates, rng).to_csv(os.path.join(target, name), index=False)
+            synthetic.append(dataset)
+    return synthetic
+
+
+def use_fixtures():
+    # Points the snapshot data source at a copy of the snapshots in Data/, or MONITORING_SNAPSHOT_DIR, completed
+    # with fixtures, so every dataset can be read. Returns the datasets that are fixtures.
+    if snapshots.SNAPSHOT_DIR == FIXTURE_DIR:
+        return []
+    synthetic = prepare(snapshots.SNAPSHOT_DIR, FIXTURE_DIR)
+    snapshots.SNAPSHOT_DIR = FIXTURE_DIR
+    if synthetic:
+        print('Synthetic fixtures for ' + ', '.join(' '.join(dataset) for dataset in synthetic))
+    return synthetic
@@ -0,0 +1,103 @@
+# Libraries
+import argparse
+import glob
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Pages render from the CSV snapshots in Data/, or MONITORING_SNAPSHOT_DIR, completed with synthetic fixtures
+# for the datasets without a snapshot (see benchmarks.fixtures), and never touch the network
+os.environ['MONITORING_DATA_SOURCE'] = 'snapshot'
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.fixtures import use_fixtures
+from monitoring.charts import clear_figures
+
+PAGES = ['Home.py'] + sorted(glob.glob(os.path.join('pages', '*.py')))
+
+# Number of selected blockchains for each benchmarked selection, None selects all of them
+SELECTIONS = {'single': 1, 'three': 3, 'all': None}
+
+
+def _tabs_key(page):
+    with open(page, encoding='utf-8') as file:
+        match = re.search(r"st\.tabs\(\[.*?\], key='(\w+)'", file.read())
+    return match.group(1) if match else None
+
+
+def _app(page, state):
+    app = AppTest.from_file(os.path.abspath(page), default_timeout=600)
+    for key, value in state.items():
+        app.session_state[key] = value
+    return app
+
+
+def measure(page, state, repeat=3):
+    # Renders the page with the given widget state: median seconds of a render without cached figures,
+    # seconds of a rerun with every figure cached, peak traced memory in bytes, figure count and the messages of
+    # the exceptions the page raised
+    renders = []
+    for _ in range(repeat):
+        clear_figures()
+        app = _app(page, state)
+        start = time.perf_counter()
+        app.run()
+        renders.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    app.run()
+    rerun = time.perf_counter() - start
+
+    clear_figures()
+    app = _app(page, state)
+    tracemalloc.start()
+    app.run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(renders), rerun, peak, len(app.get('plotly_chart')), [error.message for error in app.exception]
+
+
+def cases(page, selections=SELECTIONS):
+    # Widget states to benchmark a page with: every selection, and within it every tab of the page
+    app = AppTest.from_file(os.path.abspath(page), default_timeout=600).run()
+    if not app.multiselect:
+        yield '-', '-', {}
+        return
+    select_key, chains = app.multiselect[0].key, list(app.multiselect[0].options)
+    tabs_key = _tabs_key(page)
+    for selection in selections:
+        count = SELECTIONS[selection]
+        state = {select_key: chains[:count] if count else chains}
+        tabs = [tab.label for tab in _app(page, state).run().tabs] if tabs_key else []
+        if not tabs:
+            yield selection, '-', state
+        for tab in tabs:
+            yield selection, tab, {**state, tabs_key: tab}
+
+
+# Benchmarks every page, or the pages given: python -m benchmarks.pages [--repeat N] [--selection NAME] [page ...]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render time, peak memory and figure count of each page.')
+    parser.add_argument('pages', nargs='*', default=PAGES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--selection', choices=list(SELECTIONS), action='append')
+    args = parser.parse_args()
+
+    use_fixtures()
+    print(f"{'Page':<32}{'Selection':<11}{'Tab':<20}{'Render':>9}{'Rerun':>9}{'Peak':>10}{'Figures':>9}")
+    failures = 0
+    for page in args.pages:
+        for selection, tab, state in cases(page, args.selection or SELECTIONS):
+            render, rerun, peak, figures, exceptions = measure(page, state, args.repeat)
+            row = f'{os.path.basename(page)[:31]:<32}{selection:<11}{tab:<20}'
+            if exceptions:
+                # A page that raised did not render all of its charts, so its timings mean nothing
+                failures += 1
+                print(f'{row}FAILED: {exceptions[0].splitlines()[0]}')
+            else:
+                print(f'{row}{render:>8.2f}s{rerun:>8.2f}s{peak / 2**20:>7.1f} MB{figures:>9}')
+    if failures:
+        sys.exit(f'{failures} benchmarked renders failed')
@@ -0,0 +1,122 @@
+# Libraries
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import use_fixtures
+from monitoring import snapshots
+from monitoring.cubes import cube
+from monitoring.index import select, top
+from monitoring.schema import apply_schema
+from monitoring.transforms import shares
+
+# Sizes of the synthetic frames, as multiples of the snapshots
+SCALES = [1, 10, 100]
+
+# Label columns that identify what a row is about besides its blockchain
+_ENTITIES = ('DEX', 'Type', 'Asset', 'Marketplace', 'Collection', 'Bucket', 'Wallet')
+
+
+def scaled(data, factor, seed=0):
+    # A snapshot grown to factor times its rows the way the data grows: daily data gets more history,
+    # per DEX, collection, etc. data gets more of them and the remaining data more blockchains.
+    # Float metrics are jittered so sorts and shares do not work on repeated values.
+    rng = np.random.default_rng(seed)
+    entity = next((column for column in _ENTITIES if column in data.columns), 'Blockchain')
+    metrics = data.select_dtypes('float').columns
+    copies = []
+    for copy_number in range(factor):
+        copy = data.copy()
+        if 'Date' in copy.columns:
+            span = copy['Date'].max() - copy['Date'].min() + pd.Timedelta(days=1)
+            copy['Date'] = copy['Date'] - copy_number * span
+        elif copy_number:
+            copy[entity] = copy[entity].astype(str) + f' {copy_number}'
+        copy[metrics] = copy[metrics] * rng.uniform(0.5, 1.5, size=(len(copy), len(metrics)))
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def _chains(data, count):
+    chains = list(data['Blockchain'].unique())
+    return chains[:count] if count else chains
+
+
+def _select(count):
+    def setup(data):
+        options = _chains(data, count)
+        return lambda: select(data, options)
+    return setup
+
+
+def _top(metric, chains=None, count=20):
+    def setup(data):
+        options = _chains(data, chains)
+        # The first call ranks the rows, as the first rerun after a refresh does
+        top(data, options, metric, count)
+        return lambda: top(data, options, metric, count)
+    return setup
+
+
+def _chain_shares(metrics, chains=None):
+    def setup(data):
+        options = _chains(data, chains)
+        # The first call builds the cube, as the first rerun after a refresh does
+        cube(data)
+        return lambda: cube(data).shares(options, metrics)
+    return setup
+
+
+def _shares(index, column, metrics, chains):
+    def setup(data):
+        options = _chains(data, chains)
+        groups = options if column == 'Blockchain' else None
+        return lambda: shares(select(data, options), index, column, metrics, groups)
+    return setup
+
+
+# Transforms the pages run on every rerun: (name, dataset, setup returning the call to time)
+BENCHMARKS = [
+    ('Chain filter, 1 chain', ('Transfers', 'Daily'), _select(1)),
+    ('Chain filter, 3 chains', ('Transfers', 'Daily'), _select(3)),
+    ('Chain filter, all chains', ('Transfers', 'Daily'), _select(None)),
+    ('Heatmap filter, 1 chain', ('Transfers', 'Heatmap'), _select(1)),
+    ('Heatmap filter, all chains', ('Transfers', 'Heatmap'), _select(None)),
+    ('Top 20 DEXs', ('Swaps', 'DEXs Overview'), _top('Volume')),
+    ('Top 20 collections, 1 chain', ('NFTs', 'Collections Overview'), _top('Volume', 1)),
+    ('Top 20 collections', ('NFTs', 'Collections Overview'), _top('Volume')),
+    ('Daily chain shares', ('Transfers', 'Daily'), _chain_shares(['Volume', 'Transfers', 'Users'])),
+    ('Daily DEX shares, 1 chain', ('Swaps', 'DEXs Daily'), _shares('Date', 'DEX', ['Volume', 'Swaps', 'Swappers'], 1)),
+    ('Daily marketplace shares', ('NFTs', 'Marketplaces Daily'), _shares('Date', 'Marketplace', ['Volume', 'Sales', 'Buyers', 'NFTs'], None)),
+]
+
+
+def measure(call, repeat=5):
+    # Fastest seconds per call over repeat rounds of as many calls as fit in about 0.2 seconds
+    timer = timeit.Timer(call)
+    number = timer.autorange()[0]
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+# Times every transform on the snapshots scaled up: python -m benchmarks.transforms [--scales 1 10 100]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time per call of the page transforms on scaled snapshots.')
+    parser.add_argument('--scales', type=int, nargs='+', default=SCALES)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    use_fixtures()
+    print(f"{'Transform':<30}" + ''.join(f"{f'{scale}x':>26}" for scale in args.scales))
+    frames = {}
+    for name, dataset, setup in BENCHMARKS:
+        snapshot = frames.get(dataset)
+        if snapshot is None:
+            snapshot = frames[dataset] = snapshots.read(*dataset)
+        cells = []
+        for scale in args.scales:
+            data = apply_schema(scaled(snapshot, scale), dataset)
+            seconds = measure(setup(data), args.repeat)
+            cells.append(f'{seconds * 1e3:.3f} ms ({len(data):,} rows)')
+        print(f'{name:<30}' + ''.join(f'{cell:>26}' for cell in cells))
@@ -0,0 +1,60 @@
+# Libraries
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: refreshes are only coalesced between the threads of one process
+    fcntl = None
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Local columnar copies of the Flipside query results, one Parquet file per query ID
+CACHE_DIR = os.environ.get('MONITORING_CACHE_DIR', 'Cache')
+
+
+def _path(query_id):
+    return os.path.join(CACHE_DIR, f'{query_id}.parquet')
+
+
+@contextmanager
+def lock(query_id):
+    # Held by the one process of the host refreshing a query, while the others wait to read its result
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, f'{query_id}.lock'), 'a') as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def read(query_id):
+    # Returns (fetched at, data) of the stored result, or None when there is no usable copy
+    try:
+        table = pq.read_table(_path(query_id))
+        fetched_at = float(table.schema.metadata[b'fetched_at'])
+    except (OSError, KeyError, TypeError, ValueError, pa.ArrowException):
+        return None
+    return fetched_at, table.to_pandas()
+
+
+def write(query_id, fetched_at, data):
+    # Writes to a temporary file first so that readers never see a partial copy
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        table = table.replace_schema_metadata({**table.schema.metadata, b'fetched_at': str(fetched_at).encode()})
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        os.close(fd)
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, _path(query_id))
+    except (OSError, pa.ArrowException):
+        return False
+    return True
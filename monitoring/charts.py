@@ -0,0 +1,143 @@
+# Libraries
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from monitoring import data, metrics
+from monitoring.heatmaps import DAYS, HOURS
+from monitoring.lazy import lazy_import
+
+go = lazy_import('plotly.graph_objects')
+
+# 'svg' sends figures as built, 'webgl' draws line and scatter traces with WebGL and trims the arrays sent to the browser
+RENDER_MODE = os.environ.get('MONITORING_RENDER_MODE', 'svg')
+if RENDER_MODE not in ('svg', 'webgl'):
+    raise ValueError(f"Unknown MONITORING_RENDER_MODE '{RENDER_MODE}', expected 'svg' or 'webgl'")
+
+# Significant digits kept in the 'webgl' mode, matching what the hover labels display
+PRECISION = 6
+
+# Trace attributes holding the data points
+_ARRAYS = ('x', 'y', 'z', 'values')
+
+# Memory budget of the figure cache in bytes
+FIGURE_CACHE_BYTES = int(float(os.environ.get('MONITORING_FIGURE_CACHE_MB', 64)) * 2**20)
+
+# Built figures shared by every session, least recently used first:
+# key -> (figure, size in bytes, weak references to the frames it was built from)
+_figures = OrderedDict()
+_figures_bytes = 0
+_figures_lock = threading.Lock()
+
+
+def _size(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_size(item) for item in value) + 8 * len(value)
+    if isinstance(value, str):
+        return len(value)
+    return 8
+
+
+def _figure_size(fig):
+    return sum(_size(trace.to_plotly_json()) for trace in fig.data) + _size(fig.layout.to_plotly_json())
+
+
+def _trim(values):
+    # Day-resolution dates are sent as plain dates and floats rounded to display precision,
+    # whole numbers as integers so Plotly can pack them into the smallest integer type
+    if not isinstance(values, np.ndarray):
+        return values
+    if values.dtype.kind == 'M':
+        days = values.astype('datetime64[D]')
+        if (days == values).all():
+            return np.datetime_as_string(days)
+    elif values.dtype.kind == 'f' and np.isfinite(values).all():
+        magnitude = np.floor(np.log10(np.abs(np.where(values == 0, 1, values))))
+        scale = 10 ** (PRECISION - 1 - magnitude)
+        values = np.round(values * scale) / scale
+        if (values == np.round(values)).all() and np.abs(values).max(initial=0) < 2**31:
+            return values.astype(np.int32)
+    return values
+
+
+def lighten(fig):
+    # WebGL only draws plain lines and markers, so stacked areas and splines stay SVG
+    traces = []
+    for trace in fig.data:
+        if trace.type == 'scatter' and trace.stackgroup is None and trace.line.shape != 'spline':
+            trace = go.Scattergl(trace.to_plotly_json(), skip_invalid=True)
+        trace.update({name: _trim(trace[name]) for name in _ARRAYS if name in trace})
+        traces.append(trace)
+    return go.Figure(data=traces, layout=fig.layout)
+
+
+def cached_figure(options, build):
+    # Builds a figure once per (data, chart, selected chains) and serves it from memory afterwards. The data is
+    # the frames the running page loaded, so a figure is never served for frames it was not built from, and
+    # the chart is where its build function is defined:
+    #
+    #     fig = cached_figure(options, lambda: px.bar(df, ...).update_layout(...))
+    global _figures_bytes
+    frames = data.loaded()
+    code = build.__code__
+    key = (tuple(id(frame) for frame in frames), code.co_filename, code.co_firstlineno, tuple(options))
+    chart = (os.path.basename(code.co_filename), code.co_firstlineno)
+    with _figures_lock:
+        entry = _figures.get(key)
+        # A frame that was let go may have passed its id on to a newer one
+        if entry is not None and all(ref() is frame for ref, frame in zip(entry[2], frames)):
+            _figures.move_to_end(key)
+        else:
+            entry = None
+    if entry is not None:
+        metrics.record_chart(chart)
+        return entry[0]
+
+    start = time.perf_counter()
+    fig = build()
+    if RENDER_MODE == 'webgl':
+        fig = lighten(fig)
+    metrics.record_chart(chart, fig.layout.title.text, time.perf_counter() - start)
+    size = _figure_size(fig)
+    with _figures_lock:
+        if size <= FIGURE_CACHE_BYTES:
+            replaced = _figures.pop(key, None)
+            if replaced is not None:
+                _figures_bytes -= replaced[1]
+            _figures[key] = (fig, size, [weakref.ref(frame) for frame in frames])
+            _figures_bytes += size
+            while _figures_bytes > FIGURE_CACHE_BYTES:
+                _, (_, evicted_size, _) = _figures.popitem(last=False)
+                _figures_bytes -= evicted_size
+    return fig
+
+
+def clear_figures():
+    global _figures_bytes
+    with _figures_lock:
+        _figures.clear()
+        _figures_bytes = 0
+
+
+def share_chart(table, title):
+    # Stacked area of a shares table (index x group) whose rows already add up to 100%
+    fig = go.Figure()
+    for group in table.columns:
+        fig.add_trace(go.Scatter(name=group, x=table.index, y=table[group], mode='lines', stackgroup='one'))
+    fig.update_layout(title=title, yaxis_range=[0, 100])
+    return fig
+
+
+def heatmap_chart(values, title):
+    # Heatmap of a day x hour array, Monday on top, leaving out the hours without data
+    fig = go.Figure(go.Heatmap(z=values, x=HOURS, y=DAYS, hoverongaps=False))
+    fig.update_layout(title=title, yaxis_autorange='reversed')
+    return fig
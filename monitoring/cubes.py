@@ -0,0 +1,85 @@
+# Libraries
+import numpy as np
+import pandas as pd
+
+from monitoring.memo import per_frame
+
+# Axes of a cube, in the order of its array
+AXES = ('Blockchain', 'Date', 'Metric')
+
+
+class Cube:
+    # A daily dataset as one dense array of blockchain x date x metric with the labels of each axis, NaN where
+    # a blockchain has no row for a date. Charts slice, sum, normalize and rank it along any axis instead of
+    # filtering and pivoting the rows.
+    def __init__(self, labels, values, present):
+        self.labels = labels
+        self.values = values
+        # Blockchain x date: whether the dataset has a row for it
+        self.present = present
+
+    @classmethod
+    def from_frame(cls, data):
+        keys = data[['Blockchain', 'Date']]
+        if keys.duplicated().any():
+            raise ValueError('A cube needs at most one row per blockchain and date')
+        chains = pd.Index(data['Blockchain'].unique())
+        dates = pd.Index(data['Date'].unique()).sort_values()
+        metrics = pd.Index(data.select_dtypes('number').columns)
+        chain_rows, date_rows = chains.get_indexer(data['Blockchain']), dates.get_indexer(data['Date'])
+
+        values = np.full((len(chains), len(dates), len(metrics)), np.nan)
+        values[chain_rows, date_rows] = data[metrics].to_numpy(dtype=float)
+        present = np.zeros((len(chains), len(dates)), dtype=bool)
+        present[chain_rows, date_rows] = True
+        return cls(dict(zip(AXES, (chains, dates, metrics))), values, present)
+
+    def take(self, chains=None, metrics=None):
+        # Cube of the given blockchains and metrics, in the given order, over the dates any of them has a row for.
+        # Blockchains without rows in the dataset are kept with no rows.
+        chains = self.labels['Blockchain'] if chains is None else pd.Index(list(dict.fromkeys(chains)))
+        metrics = self.labels['Metric'] if metrics is None else pd.Index(metrics)
+        chain_rows = self.labels['Blockchain'].get_indexer(chains)
+        metric_rows = self.labels['Metric'].get_indexer(metrics)
+        known = chain_rows >= 0
+
+        present = np.zeros((len(chains), len(self.labels['Date'])), dtype=bool)
+        present[known] = self.present[chain_rows[known]]
+        dates = present.any(axis=0).nonzero()[0]
+        values = np.full((len(chains), len(dates), len(metrics)), np.nan)
+        values[known] = self.values[np.ix_(chain_rows[known], dates, metric_rows)]
+        labels = {'Blockchain': chains, 'Date': self.labels['Date'][dates], 'Metric': metrics}
+        return Cube(labels, values, present[:, dates])
+
+    def sum(self, axis):
+        # Totals along an axis, counting missing rows as zero: an array over the two remaining axes
+        return np.nansum(self.values, axis=AXES.index(axis))
+
+    def normalize(self, axis):
+        # Percentage of every value in the total along an axis, zero where the total is zero
+        values = np.nan_to_num(self.values)
+        totals = values.sum(axis=AXES.index(axis), keepdims=True)
+        values = np.divide(100 * values, totals, out=np.zeros_like(values), where=totals != 0)
+        return Cube(self.labels, values, self.present)
+
+    def rank(self, axis, metric):
+        # Labels of an axis ordered by their total of a metric, largest first
+        if axis not in ('Blockchain', 'Date'):
+            raise ValueError(f"Cannot rank the '{axis}' axis, expected 'Blockchain' or 'Date'")
+        totals = self.sum('Date' if axis == 'Blockchain' else 'Blockchain')[..., self.labels['Metric'].get_loc(metric)]
+        return self.labels[axis][np.argsort(-totals, kind='stable')]
+
+    def table(self, metrics=None):
+        # Date x (metric, blockchain) frame, e.g. table()['Volume'] is a date x blockchain table
+        metrics = list(self.labels['Metric'] if metrics is None else metrics)
+        values = self.values[..., self.labels['Metric'].get_indexer(metrics)].transpose(1, 2, 0)
+        columns = pd.MultiIndex.from_product([metrics, self.labels['Blockchain']])
+        return pd.DataFrame(values.reshape(len(self.labels['Date']), -1), index=self.labels['Date'], columns=columns)
+
+    def shares(self, chains, metrics):
+        # Same as transforms.shares(select(data, chains), 'Date', 'Blockchain', metrics, chains)
+        return self.take(chains, metrics).normalize('Blockchain').table()
+
+
+# Cubes of the loaded daily datasets, which charts slice rather than pivoting the rows on every rerun
+cube = per_frame(Cube.from_frame)
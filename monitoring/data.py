@@ -0,0 +1,338 @@
+# Libraries
+import io
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.request import urlopen
+
+import pandas as pd
+
+from monitoring import cache, history, metrics, shared, snapshots
+from monitoring.schema import apply_schema
+
+# Flipside Crypto Queries
+API_URL = 'https://node-api.flipsidecrypto.com/api/v2/queries/{}/data/latest'
+
+QUERIES = {
+    ('Transactions', 'Overview'): '579714e6-986e-421a-85dd-c32a8b41b25c',
+    ('Transactions', 'Daily'): '4e0c69ff-9395-43c1-af49-f590f864d339',
+    ('Transactions', 'Heatmap'): '9d8d54d4-b700-4d85-af17-8c29aa29d334',
+    ('Transactions', 'Fee Payers'): '7eae69ea-2387-420d-b4b9-6eceeb5ef22d',
+
+    ('Transfers', 'Overview'): '41eb418f-d231-4a1f-a1c8-e7cc0ff2fddb',
+    ('Transfers', 'Daily'): '76276234-81ba-44fd-8341-7cde62d30abc',
+    ('Transfers', 'Heatmap'): '933b930f-b611-469e-9e03-b0d5c5b0242b',
+    ('Transfers', 'Distribution'): 'a17c8548-2834-4600-bc78-a0efb6d12de4',
+    ('Transfers', 'Transferring Users'): '2f9e94d0-79b9-49a5-be9a-eb289e9890d4',
+    ('Transfers', 'Wallet Types'): 'cc07b022-fd08-459f-a9a3-cf8082221414',
+
+    ('Swaps', 'Overview'): 'b3d90320-3fcb-44f0-b0b9-3f72ee779dcb',
+    ('Swaps', 'Daily'): 'fed187af-6c8e-49fc-82d1-1975926e3951',
+    ('Swaps', 'Heatmap'): '3fa50926-77bc-44f8-b190-7bd48d408c85',
+    ('Swaps', 'DEXs Overview'): '9e0dace3-69d7-44fb-810c-e3b819b2b8de',
+    ('Swaps', 'DEXs Daily'): '5563d79a-a937-4e04-a74e-b75f284c57cb',
+    ('Swaps', 'Types Overview'): '770cc6a0-bc32-49fb-942b-84c82da5a533',
+    ('Swaps', 'Types Daily'): '3ec65249-62fe-49e6-bf85-513af7896e34',
+    ('Swaps', 'Assets Overview'): '060d6f19-6e02-4be3-b262-05a91e694986',
+    ('Swaps', 'Assets Daily'): '0139649d-6c38-4ee6-9e20-fff34e452fe6',
+
+    ('NFTs', 'Overview'): 'a9dee9b9-bfd8-4fed-b49b-a03767306d89',
+    ('NFTs', 'Daily'): '6ec4aca1-3d25-4233-bec2-0443b27d3e6c',
+    ('NFTs', 'Heatmap'): '62fa2182-ca1b-4648-a363-8d1ce591253e',
+    ('NFTs', 'Marketplaces Overview'): '8f4e8520-52af-4d57-b29e-e513f62f8fa9',
+    ('NFTs', 'Marketplaces Daily'): '8fcca211-4bc6-444d-8696-0a583e2966a6',
+    ('NFTs', 'Collections Overview'): 'eaa5902c-0206-4fd7-8eb4-b15ecf9a71b4',
+    ('NFTs', 'Collections Daily'): '3cb9e6f6-849b-47e6-8c7e-b454e1394d6b',
+}
+
+DATASETS = {query_id: dataset for dataset, query_id in QUERIES.items()}
+
+# Where datasets are loaded from:
+# 'api' queries Flipside, 'record' queries Flipside and saves every response as a snapshot,
+# 'snapshot' only reads the local snapshots and never touches the network or the local cache,
+# 'shared' reads the datasets published by the dataset service (python -m monitoring.shared) and never loads any itself
+DATA_SOURCE = os.environ.get('MONITORING_DATA_SOURCE', 'api')
+if DATA_SOURCE not in ('api', 'record', 'snapshot', 'shared'):
+    raise ValueError(f"Unknown MONITORING_DATA_SOURCE '{DATA_SOURCE}', expected 'api', 'record', 'snapshot' or 'shared'")
+
+# Seconds between refreshes of a dataset, matching the 24 hour re-run of the Flipside queries
+REFRESH_INTERVAL = int(os.environ.get('MONITORING_REFRESH_INTERVAL', 24 * 60 * 60))
+
+# Datasets refreshed on their own schedule: (sector, dataset) -> seconds
+REFRESH_INTERVALS = {}
+
+# Seconds to wait before retrying a refresh that was started but did not complete
+RETRY_INTERVAL = 600
+
+# Seconds between two checks of the refresh scheduler
+SCHEDULER_INTERVAL = 60
+
+# Process-wide cache shared by every page and session: query ID -> (fetched at, data)
+_cache = {}
+_lock = threading.Lock()
+
+# Query IDs currently being refreshed in the background, and when each refresh was last started
+_refreshing = set()
+_attempts = {}
+_scheduler = None
+
+# Incremented whenever a loaded dataset changes, so anything derived from the data can be invalidated
+version = 0
+
+# Oldest date in the latest result of each daily dataset, where the window covered by its query starts
+_windows = {}
+
+# Latest overviews as returned by the API: (sector, dataset) -> (fetched at, data)
+_overviews = {}
+
+# Refreshes in flight in this process: query ID -> Future of the refreshed data
+_inflight = {}
+
+# Whether stored datasets are also published for the page processes, only in the dataset service
+_publishing = False
+
+# Published versions of the datasets loaded from the dataset service: query ID -> stamp
+_stamps = {}
+
+# Frames last returned by load_data in each thread, i.e. to the page script running in it
+_loaded = threading.local()
+
+
+def fetch(query_id):
+    dataset = DATASETS[query_id]
+    start = time.perf_counter()
+    if DATA_SOURCE == 'snapshot':
+        data = snapshots.read(*dataset)
+        metrics.record_fetch(dataset, 0.0, time.perf_counter() - start, len(data), os.path.getsize(snapshots.path(*dataset)))
+        return data
+
+    with urlopen(API_URL.format(query_id)) as response:
+        raw = response.read()
+    downloaded = time.perf_counter()
+    data = pd.read_json(io.BytesIO(raw))
+    metrics.record_fetch(dataset, downloaded - start, time.perf_counter() - downloaded, len(data), len(raw))
+    if DATA_SOURCE == 'record':
+        snapshots.write(*dataset, data)
+    return data
+
+
+def _store(query_id, fetched_at, data, write=True):
+    global version
+    with _lock:
+        _cache[query_id] = (fetched_at, data)
+        version += 1
+    if write and DATA_SOURCE not in ('snapshot', 'shared'):
+        cache.write(query_id, fetched_at, data)
+    if _publishing:
+        shared.publish(query_id, fetched_at, data)
+
+
+def _overview(dataset):
+    # The latest overview from the API, rebuilt over the daily history once that reaches back before the query window
+    daily = history.DAILY[dataset]
+    with _lock:
+        fetched_at, data = _overviews[dataset]
+        window = _windows.get(daily)
+    stored = history.read(daily)
+    if window is None or stored is None or stored['Date'].min() >= window:
+        return fetched_at, data
+    return fetched_at, apply_schema(history.rollup(stored, data), dataset)
+
+
+def _refresh(query_id):
+    # Downloads the latest result and stores it both in memory and in the local cache
+    fetched_at = time.time()
+    dataset = DATASETS[query_id]
+    try:
+        data = apply_schema(fetch(query_id), dataset)
+    except Exception:
+        metrics.record_fetch_failure(dataset)
+        raise
+    if DATA_SOURCE == 'snapshot':
+        _store(query_id, fetched_at, data)
+        return data
+
+    if dataset in history.OVERVIEWS:
+        # Only the days after the stored history are added to it, and the pages get the whole history
+        history.append(dataset, data)
+        with _lock:
+            _windows[dataset] = data['Date'].min()
+        data = apply_schema(history.read(dataset), dataset)
+    elif dataset in history.DAILY:
+        with _lock:
+            _overviews[dataset] = (fetched_at, data)
+        data = _overview(dataset)[1]
+    _store(query_id, fetched_at, data)
+
+    overview = history.OVERVIEWS.get(dataset)
+    if overview in _overviews:
+        _store(QUERIES[overview], *_overview(overview))
+    return data
+
+
+def _refresh_once_per_host(query_id):
+    # Processes of the host take turns on the lock. One that waited adopts the result another one just wrote
+    # to the local cache rather than downloading it again.
+    if DATA_SOURCE == 'snapshot':
+        return _refresh(query_id)
+    with _lock:
+        current = _cache.get(query_id)
+    with cache.lock(query_id):
+        entry = cache.read(query_id)
+        if entry is not None and not _is_stale(query_id, entry) and (current is None or entry[0] > current[0]):
+            _store(query_id, *entry, write=False)
+            return entry[1]
+        return _refresh(query_id)
+
+
+def refresh(query_id):
+    # Single flight: concurrent callers for the same query wait on one refresh and share its result,
+    # so a dataset is downloaded at most once per refresh however many sessions ask for it
+    with _lock:
+        future = _inflight.get(query_id)
+        leader = future is None
+        if leader:
+            future = _inflight[query_id] = Future()
+    if leader:
+        try:
+            future.set_result(_refresh_once_per_host(query_id))
+        except BaseException as error:
+            future.set_exception(error)
+        finally:
+            with _lock:
+                del _inflight[query_id]
+    return future.result()
+
+
+def _refresh_in_background(query_id):
+    with _lock:
+        if query_id in _refreshing or time.time() - _attempts.get(query_id, 0) < RETRY_INTERVAL:
+            return
+        _refreshing.add(query_id)
+        _attempts[query_id] = time.time()
+
+    def run():
+        try:
+            refresh(query_id)
+        finally:
+            with _lock:
+                _refreshing.discard(query_id)
+
+    threading.Thread(target=run, name=f'refresh-{query_id}', daemon=True).start()
+
+
+def _shared_entry(query_id):
+    # The dataset as last published by the dataset service, mapped again only when a new version is published
+    stamp = shared.stamp(query_id)
+    with _lock:
+        entry = _cache.get(query_id)
+        if stamp is None or _stamps.get(query_id) == stamp:
+            return entry
+    fetched_at, data = shared.read(query_id)
+    with _lock:
+        _stamps[query_id] = stamp
+    _store(query_id, fetched_at, data)
+    return fetched_at, data
+
+
+def _cached_entry(query_id):
+    if DATA_SOURCE == 'shared':
+        return _shared_entry(query_id)
+    with _lock:
+        entry = _cache.get(query_id)
+    if entry is None and DATA_SOURCE != 'snapshot':
+        # After a restart the previous result is served from the local cache
+        entry = cache.read(query_id)
+        if entry is not None:
+            with _lock:
+                entry = _cache.setdefault(query_id, entry)
+    return entry
+
+
+def _is_stale(query_id, entry):
+    # The dataset service refreshes the shared datasets
+    if DATA_SOURCE in ('snapshot', 'shared'):
+        return False
+    return time.time() - entry[0] >= REFRESH_INTERVALS.get(DATASETS[query_id], REFRESH_INTERVAL)
+
+
+def _schedule():
+    while True:
+        for query_id in DATASETS:
+            entry = _cached_entry(query_id)
+            if entry is None or _is_stale(query_id, entry):
+                _refresh_in_background(query_id)
+        time.sleep(SCHEDULER_INTERVAL)
+
+
+def start_scheduler():
+    # Keeps every dataset loaded and refreshed out of band, so pages are always served from memory
+    global _scheduler
+    with _lock:
+        if _scheduler is not None or DATA_SOURCE in ('snapshot', 'shared'):
+            return
+        _scheduler = threading.Thread(target=_schedule, name='refresh-scheduler', daemon=True)
+    _scheduler.start()
+
+
+def get_data(data_sector, data_type):
+    query_id = QUERIES.get((data_sector, data_type))
+    if query_id is None:
+        return None
+
+    entry = _cached_entry(query_id)
+    if entry is None and DATA_SOURCE == 'shared':
+        raise FileNotFoundError(f'No dataset published at {shared.path(query_id)}, start the dataset service with python -m monitoring.shared')
+    if entry is None:
+        # Only the very first load of a dataset without any stored copy waits on the API
+        return refresh(query_id)
+    if _is_stale(query_id, entry):
+        _refresh_in_background(query_id)
+    return entry[1]
+
+
+def _timed_get_data(data_sector, data_type):
+    start = time.perf_counter()
+    data = get_data(data_sector, data_type)
+    metrics.record_load((data_sector, data_type), time.perf_counter() - start)
+    return data
+
+
+def load_data(*datasets):
+    # Loads every (sector, dataset) pair concurrently and returns the frames in the same order
+    start_scheduler()
+    metrics.start_server()
+    with ThreadPoolExecutor(max_workers=len(datasets)) as executor:
+        futures = [executor.submit(_timed_get_data, *dataset) for dataset in datasets]
+    frames = [future.result() for future in futures]
+    _loaded.frames = tuple(frame for frame in frames if frame is not None)
+    return frames
+
+
+def loaded():
+    # Frames the running page loaded, which its charts are built from
+    return getattr(_loaded, 'frames', ())
+
+
+def serve():
+    # Dataset service: loads every dataset, publishes it for the page processes and keeps it refreshed.
+    # Returns after publishing in snapshot mode, where nothing is ever refreshed.
+    global _publishing
+    if DATA_SOURCE == 'shared':
+        raise ValueError("The dataset service loads the datasets itself, expected MONITORING_DATA_SOURCE 'api', 'record' or 'snapshot'")
+    _publishing = True
+    for query_id, dataset in DATASETS.items():
+        entry = _cached_entry(query_id)
+        try:
+            if entry is None or _is_stale(query_id, entry):
+                refresh(query_id)
+            else:
+                shared.publish(query_id, *entry)
+        except Exception as error:
+            # The scheduler retries the datasets that could not be loaded
+            print(f'Could not publish {dataset[0]} {dataset[1]}: {error}')
+            continue
+        print(f'Published {dataset[0]} {dataset[1]} at {shared.path(query_id)}')
+    if DATA_SOURCE != 'snapshot':
+        _schedule()
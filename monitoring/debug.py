@@ -0,0 +1,45 @@
+# Libraries
+import os
+
+import pandas as pd
+import streamlit as st
+
+from monitoring import metrics
+
+# Shows the timings on every page when set, otherwise only on pages opened with ?debug=1
+DEBUG = os.environ.get('MONITORING_DEBUG', '') not in ('', '0')
+
+
+def debug_sidebar(page):
+    # Latest fetch and load of every dataset, and the charts of the page, in the sidebar
+    if not DEBUG and st.query_params.get('debug') != '1':
+        return
+    fetches, loads, charts = metrics.snapshot()
+
+    datasets = pd.DataFrame([
+        {
+            'Dataset': f'{sector} {dataset}',
+            'Load (ms)': loads.get((sector, dataset), {}).get('last', 0) * 1e3,
+            'Network (ms)': fetches.get((sector, dataset), {}).get('network', 0) * 1e3,
+            'Parse (ms)': fetches.get((sector, dataset), {}).get('parse', 0) * 1e3,
+            'Rows': fetches.get((sector, dataset), {}).get('rows', 0),
+            'KB': fetches.get((sector, dataset), {}).get('bytes', 0) / 1e3
+        }
+        for sector, dataset in sorted(set(fetches) | set(loads))
+    ])
+    page_charts = pd.DataFrame([
+        {
+            'Line': line,
+            'Chart': entry['title'],
+            'Build (ms)': entry.get('last', 0) * 1e3,
+            'Builds': entry['builds'],
+            'Cache Hits': entry['hits']
+        }
+        for (name, line), entry in sorted(charts.items()) if name == os.path.basename(page)
+    ])
+
+    with st.sidebar:
+        st.subheader('Datasets')
+        st.dataframe(datasets.round(1), hide_index=True)
+        st.subheader('Charts')
+        st.dataframe(page_charts.round(1), hide_index=True)
@@ -0,0 +1,40 @@
+# Libraries
+import numpy as np
+import pandas as pd
+
+from monitoring.memo import per_frame
+
+# Rows and columns of every heatmap; the Day column of the datasets reads like '1.Monday'
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+HOURS = list(range(24))
+
+
+class Heatmaps:
+    # Every metric of every blockchain of a heatmap dataset as one array of blockchain x metric x day x hour,
+    # NaN where the dataset has no row. A chart is a slice of it, and comparing blockchains is array math,
+    # e.g. values[chains['Ethereum']] - values[chains['Solana']].
+    def __init__(self, data):
+        self.chains = {chain: position for position, chain in enumerate(data['Blockchain'].unique())}
+        metrics = [column for column in data.select_dtypes('number').columns if column != 'Hour']
+        self.metrics = {metric: position for position, metric in enumerate(metrics)}
+
+        chains = pd.Index(list(self.chains)).get_indexer(data['Blockchain'])
+        days = data['Day'].astype(str).str.split('.').str[0].astype(int).to_numpy() - 1
+        hours = data['Hour'].to_numpy(dtype=int)
+        self.values = np.full((len(self.chains), len(metrics), len(DAYS), len(HOURS)), np.nan)
+        self.values[chains, :, days, hours] = data[metrics].to_numpy(dtype=float)
+
+    def chain(self, chain):
+        # Day x hour array of every metric of a blockchain: metric -> array, all NaN for a blockchain without rows
+        if chain not in self.chains:
+            return {metric: np.full((len(DAYS), len(HOURS)), np.nan) for metric in self.metrics}
+        return {metric: self.values[self.chains[chain], position] for metric, position in self.metrics.items()}
+
+
+# Dense arrays of the loaded heatmap datasets
+heatmaps = per_frame(Heatmaps)
+
+
+def heatmap(data, chain):
+    # Day x hour arrays of a blockchain: metric -> array
+    return heatmaps(data).chain(chain)
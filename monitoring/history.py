@@ -0,0 +1,113 @@
+# Libraries
+import glob
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from monitoring.schema import EXTREMES, RATIOS, SUMS
+
+# Daily results accumulated beyond the 30 days each query covers, one Parquet file per dataset and month,
+# e.g. History/transfers_daily/2022-12.parquet
+HISTORY_DIR = os.environ.get('MONITORING_HISTORY_DIR', 'History')
+
+# Daily datasets kept as history, each with the overview rebuilt from it
+OVERVIEWS = {
+    ('Transactions', 'Daily'): ('Transactions', 'Overview'),
+    ('Transfers', 'Daily'): ('Transfers', 'Overview'),
+    ('Swaps', 'Daily'): ('Swaps', 'Overview'),
+    ('Swaps', 'DEXs Daily'): ('Swaps', 'DEXs Overview'),
+    ('Swaps', 'Types Daily'): ('Swaps', 'Types Overview'),
+    ('Swaps', 'Assets Daily'): ('Swaps', 'Assets Overview'),
+    ('NFTs', 'Daily'): ('NFTs', 'Overview'),
+    ('NFTs', 'Marketplaces Daily'): ('NFTs', 'Marketplaces Overview'),
+    ('NFTs', 'Collections Daily'): ('NFTs', 'Collections Overview'),
+}
+DAILY = {overview: daily for daily, overview in OVERVIEWS.items()}
+
+
+def _directory(dataset):
+    return os.path.join(HISTORY_DIR, '_'.join(dataset).lower().replace(' ', '_'))
+
+
+def _write(path, data):
+    # Writes to a temporary file first so that readers never see a partial month
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    pq.write_table(pa.Table.from_pandas(data, preserve_index=False), tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _months(dataset):
+    return sorted(glob.glob(os.path.join(_directory(dataset), '*.parquet')))
+
+
+def latest(dataset):
+    # Most recent stored date, or None when nothing is stored yet
+    months = _months(dataset)
+    if not months:
+        return None
+    return pd.to_datetime(pd.read_parquet(months[-1], columns=['Date'])['Date']).max()
+
+
+def append(dataset, data):
+    # Stores the rows of the dates after the stored history and returns how many there were.
+    # Dates already stored are kept as they are, so every refresh only adds the new days.
+    stored = latest(dataset)
+    new = data if stored is None else data[data['Date'] > stored]
+    if new.empty:
+        return 0
+    new = new.astype({column: str for column in new.select_dtypes('category').columns})
+    for month, rows in new.groupby(new['Date'].dt.strftime('%Y-%m')):
+        path = os.path.join(_directory(dataset), f'{month}.parquet')
+        if os.path.exists(path):
+            rows = pd.concat([pd.read_parquet(path), rows], ignore_index=True)
+        _write(path, rows)
+    return len(new)
+
+
+def read(dataset):
+    # The whole stored history, most recent day first, or None when nothing is stored yet
+    months = _months(dataset)
+    if not months:
+        return None
+    data = pd.concat([pd.read_parquet(month) for month in months], ignore_index=True)
+    data['Date'] = pd.to_datetime(data['Date'])
+    return data.sort_values('Date', ascending=False, kind='stable', ignore_index=True)
+
+
+def rollup(daily, overview):
+    # The overview rebuilt over the whole daily history, for the rows of the latest overview
+    keys = [
+        column for column in overview.columns
+        if column in daily.columns and not pd.api.types.is_numeric_dtype(overview[column])
+    ]
+    # Sums and extremes are rebuilt; distinct counts and medians cannot be and keep the values of the latest overview
+    aggregates = {
+        column: how for column, how in {**dict.fromkeys(SUMS, 'sum'), **EXTREMES}.items()
+        if column in daily and column in overview
+    }
+    groups = daily.groupby(keys, observed=True)
+    rebuilt = groups.agg(aggregates)
+    rebuilt['Days'] = groups['Date'].nunique()
+    rebuilt = rebuilt.reset_index().astype({key: str for key in keys})
+
+    replaced = [column for column in rebuilt.columns if column in overview.columns and column not in keys]
+    data = overview.drop(columns=replaced).astype({key: str for key in keys}).merge(rebuilt, on=keys, how='left')
+    data['Seconds'] = data['Days'] * 24 * 60 * 60
+    # Ratios are only derived again when both of their columns cover the whole history. Dividing by a distinct
+    # count of the latest query, e.g. Sales/Buyer, or dividing it, e.g. Users/Day, would mix two periods.
+    derived = {column for column in rebuilt.columns if column not in keys} | {'Seconds'}
+    for column, numerator, denominator in RATIOS:
+        if column in overview and numerator in derived and denominator in derived:
+            data[column] = data[numerator] / data[denominator]
+    for column in overview.columns:
+        # Ratios such as Volume/Day or Sales/Buyer, whose denominator is the plural column
+        if '/' in column:
+            numerator, denominator = column.split('/')
+            if numerator in derived and f'{denominator}s' in derived:
+                data[column] = data[numerator] / data[f'{denominator}s']
+    return data[list(overview.columns)]
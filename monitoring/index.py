@@ -0,0 +1,86 @@
+# Libraries
+import functools
+import weakref
+
+import numpy as np
+
+from monitoring.memo import per_frame
+
+
+class Partitions:
+    # Row positions of every value of a column, so a selection is a dictionary lookup plus a concat
+    def __init__(self, data, column):
+        self._data = weakref.ref(data)
+        self.positions = data.groupby(column, observed=True, sort=False).indices
+        self.complete = sum(len(rows) for rows in self.positions.values()) == len(data)
+
+    def select(self, values):
+        data = self._data()
+        rows = [self.positions[value] for value in dict.fromkeys(values) if value in self.positions]
+        if len(rows) == len(self.positions) and self.complete:
+            return data
+        if len(rows) == 1:
+            return data.take(rows[0])
+        # Row positions are sorted to keep the original order of the rows, as DataFrame.query does
+        return data.take(np.sort(np.concatenate(rows)) if rows else [])
+
+
+# Partition indexes of the loaded datasets, one per column
+_partitions = per_frame(Partitions)
+
+
+def partitions(data, column='Blockchain'):
+    return _partitions(data, column)
+
+
+def select(data, values, column='Blockchain'):
+    # Equivalent to data.query(f'{column} == @values'), without scanning the whole frame
+    return partitions(data, column).select(values)
+
+
+class Ranking:
+    # Row positions of every value of a column ordered by a metric, largest first and NaN last, so the top rows
+    # of a selection are the heads of its values merged rather than a sort of the whole selection
+    def __init__(self, data, metric, column):
+        self._data = weakref.ref(data)
+        self.metric = data[metric].to_numpy(dtype=float)
+        index = partitions(data, column)
+        self.ranked = {
+            value: rows[np.argsort(-self.metric[rows], kind='stable')] for value, rows in index.positions.items()
+        }
+        self.order = np.argsort(-self.metric, kind='stable')
+        self.complete = index.complete
+
+    @functools.cached_property
+    def ascending(self):
+        # Row positions ordered by the metric, smallest first and NaN last, ties in the original order
+        return np.argsort(self.metric, kind='stable')
+
+    def top(self, values, count):
+        data = self._data()
+        heads = [self.ranked[value][:count] for value in dict.fromkeys(values) if value in self.ranked]
+        if len(heads) == len(self.ranked) and self.complete:
+            rows = self.order[:count]
+        elif len(heads) == 1:
+            rows = heads[0]
+        elif heads:
+            # Ties keep the original order of the rows, as a stable sort of the selection does
+            rows = np.concatenate(heads)
+            rows = rows[np.lexsort((rows, -self.metric[rows]))][:count]
+        else:
+            rows = []
+        return data.take(rows)
+
+
+# Rankings of the loaded datasets, one per metric and column
+_rankings = per_frame(Ranking)
+
+
+def ranking(data, metric, column='Blockchain'):
+    return _rankings(data, metric, column)
+
+
+def top(data, values, metric, count=20, column='Blockchain'):
+    # Equivalent to select(data, values, column).sort_values(metric, ascending=False).head(count),
+    # without sorting the selection
+    return ranking(data, metric, column).top(values, count)
@@ -0,0 +1,19 @@
+# Libraries
+import importlib
+
+
+class _LazyModule:
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+    def __repr__(self):
+        return f'<lazy module {self._name!r}>'
+
+
+def lazy_import(name):
+    # Stands in for the module and only imports it when one of its attributes is first used,
+    # so pages that end before building a chart never pay for Plotly
+    return _LazyModule(name)
@@ -0,0 +1,19 @@
+# Libraries
+import weakref
+
+
+def per_frame(build):
+    # Wraps build(data, *args) so it runs once per loaded frame and arguments. The result is kept while the frame
+    # is alive and dropped with it, so a refreshed dataset is built again, and a frame that reuses the id of one
+    # that was let go is never served its result.
+    results = {}
+
+    def cached(data, *args):
+        key = (id(data), *args)
+        entry = results.get(key)
+        if entry is None or entry[0]() is not data:
+            entry = (weakref.ref(data), build(data, *args))
+            results[key] = entry
+            weakref.finalize(data, results.pop, key, None)
+        return entry[1]
+    return cached
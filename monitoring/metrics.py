@@ -0,0 +1,136 @@
+# Libraries
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local endpoint serving the metrics in the Prometheus text format, disabled unless a port is set
+METRICS_HOST = os.environ.get('MONITORING_METRICS_HOST', '127.0.0.1')
+METRICS_PORT = os.environ.get('MONITORING_METRICS_PORT')
+
+# Fetches of each dataset from its source: (sector, dataset) -> network and parse seconds, rows and bytes
+# of the latest fetch, when it completed, and how many fetches completed or failed
+fetches = {}
+
+# Dataset loads by the pages, mostly served from memory: (sector, dataset) -> latest seconds, calls and total seconds
+loads = {}
+
+# Chart builds: (page, line) -> title, latest seconds, builds, total seconds and figure cache hits
+charts = {}
+
+_lock = threading.Lock()
+_server = None
+
+
+def record_fetch(dataset, network, parse, rows, size):
+    with _lock:
+        entry = fetches.setdefault(dataset, {'fetches': 0, 'failures': 0})
+        entry.update(network=network, parse=parse, rows=rows, bytes=size, fetched_at=time.time())
+        entry['fetches'] += 1
+
+
+def record_fetch_failure(dataset):
+    with _lock:
+        fetches.setdefault(dataset, {'fetches': 0, 'failures': 0})['failures'] += 1
+
+
+def record_load(dataset, seconds):
+    with _lock:
+        entry = loads.setdefault(dataset, {'calls': 0, 'seconds': 0.0})
+        entry['last'] = seconds
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+
+
+def record_chart(chart, title=None, seconds=None):
+    # A build when seconds is given, otherwise a figure served from the cache
+    with _lock:
+        entry = charts.setdefault(chart, {'title': '', 'builds': 0, 'seconds': 0.0, 'hits': 0})
+        if seconds is None:
+            entry['hits'] += 1
+            return
+        entry['title'] = title or ''
+        entry['last'] = seconds
+        entry['builds'] += 1
+        entry['seconds'] += seconds
+
+
+def snapshot():
+    # Copies of the fetch, load and chart tables that can be read while the pages keep recording
+    with _lock:
+        return tuple({key: dict(entry) for key, entry in table.items()} for table in (fetches, loads, charts))
+
+
+# Exposed metrics: (name, type, help, table, field)
+_METRICS = [
+    ('monitoring_fetch_network_seconds', 'gauge', 'Seconds spent downloading the latest fetch of a dataset', fetches, 'network'),
+    ('monitoring_fetch_parse_seconds', 'gauge', 'Seconds spent parsing the latest fetch of a dataset', fetches, 'parse'),
+    ('monitoring_fetch_rows', 'gauge', 'Rows in the latest fetch of a dataset', fetches, 'rows'),
+    ('monitoring_fetch_bytes', 'gauge', 'Bytes in the latest fetch of a dataset', fetches, 'bytes'),
+    ('monitoring_fetch_timestamp_seconds', 'gauge', 'Unix time the latest fetch of a dataset completed', fetches, 'fetched_at'),
+    ('monitoring_fetches_total', 'counter', 'Completed fetches of a dataset', fetches, 'fetches'),
+    ('monitoring_fetch_failures_total', 'counter', 'Failed fetches of a dataset', fetches, 'failures'),
+    ('monitoring_load_seconds', 'gauge', 'Seconds the latest load of a dataset by a page took', loads, 'last'),
+    ('monitoring_loads_total', 'counter', 'Loads of a dataset by the pages', loads, 'calls'),
+    ('monitoring_load_seconds_total', 'counter', 'Seconds spent loading a dataset for the pages', loads, 'seconds'),
+    ('monitoring_chart_build_seconds', 'gauge', 'Seconds the latest build of a chart took', charts, 'last'),
+    ('monitoring_chart_builds_total', 'counter', 'Builds of a chart', charts, 'builds'),
+    ('monitoring_chart_build_seconds_total', 'counter', 'Seconds spent building a chart', charts, 'seconds'),
+    ('monitoring_chart_cache_hits_total', 'counter', 'Times a chart was served from the figure cache', charts, 'hits'),
+]
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(table, key, entry):
+    if table is charts:
+        labels = {'page': key[0], 'line': key[1], 'title': entry['title']}
+    else:
+        labels = {'sector': key[0], 'dataset': key[1]}
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def render():
+    # Every metric in the Prometheus text exposition format
+    lines = []
+    with _lock:
+        for name, kind, description, table, field in _METRICS:
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key, entry in table.items():
+                if field in entry:
+                    lines.append(f'{name}{{{_labels(table, key, entry)}}} {entry[field]}')
+    return '\n'.join(lines) + '\n'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    # Serves http://METRICS_HOST:METRICS_PORT/metrics once per process when MONITORING_METRICS_PORT is set
+    global _server
+    with _lock:
+        if _server is not None or not METRICS_PORT:
+            return
+        try:
+            _server = ThreadingHTTPServer((METRICS_HOST, int(METRICS_PORT)), _Handler)
+        except OSError:
+            # Another process of the app already serves the port, so this one does not try again
+            _server = False
+            return
+    threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
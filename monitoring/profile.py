@@ -0,0 +1,56 @@
+# Libraries
+import glob
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Every page of the app, in sidebar order
+PAGES = ['Home.py'] + sorted(glob.glob(os.path.join('pages', '*.py')))
+
+# Written to stderr right before the page runs, so the imports of the test harness itself are not counted
+_MARKER = 'monitoring.profile: page start'
+
+
+def _run(page):
+    # Runs in the child interpreter: first render of the page, then a rerun with everything imported and cached
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.abspath(page), default_timeout=600)
+    print(_MARKER, file=sys.stderr, flush=True)
+    start = time.perf_counter()
+    app.run()
+    first_render = time.perf_counter() - start
+    start = time.perf_counter()
+    app.run()
+    rerun = time.perf_counter() - start
+    print(first_render, rerun, len(app.exception))
+
+
+def profile(page):
+    # Profiles a page in a fresh interpreter, as a newly started replica would serve it:
+    # returns seconds spent importing modules, first render seconds, rerun seconds and the number of exceptions
+    child = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'monitoring.profile', '--page', page],
+        capture_output=True, text=True
+    )
+    if child.returncode != 0 or _MARKER not in child.stderr:
+        raise RuntimeError(f'Profiling {page} failed:\n{child.stderr[-2000:]}')
+    log = child.stderr.split(_MARKER)[-1]
+    imports = sum(int(self_time) for self_time in re.findall(r'^import time:\s+(\d+) \|', log, re.MULTILINE)) / 1e6
+    first_render, rerun, exceptions = child.stdout.split()[-3:]
+    return imports, float(first_render), float(rerun), int(exceptions)
+
+
+# Reports import and render time of every page: python -m monitoring.profile [page ...]
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--page']:
+        _run(sys.argv[2])
+        sys.exit()
+
+    print(f"{'Page':<40}{'Imports':>10}{'First render':>15}{'Rerun':>10}")
+    for page in sys.argv[1:] or PAGES:
+        imports, first_render, rerun, exceptions = profile(page)
+        note = f'  ({exceptions} exceptions)' if exceptions else ''
+        print(f'{os.path.basename(page):<40}{imports:>9.2f}s{first_render:>14.2f}s{rerun:>9.2f}s{note}')
@@ -0,0 +1,62 @@
+# Libraries
+import os
+
+import pandas as pd
+
+from monitoring.memo import per_frame
+from monitoring.schema import EXTREMES, RATIOS, SUMS
+
+# Most points a chart over time draws per series: longer histories are drawn by week, then by month
+MAX_POINTS = int(os.environ.get('MONITORING_MAX_POINTS', 120))
+
+# Resolutions coarser than a day: name -> pandas period
+RESOLUTIONS = {'Weekly': 'W', 'Monthly': 'M'}
+
+
+def rollup(daily, resolution):
+    # Daily rows aggregated by week or month, dated by the first day of the period and with the number of days
+    # it covers in a Days column. Sums and extremes as in schema.SUMS and EXTREMES, ratios re-derived from them,
+    # and the remaining metrics (distinct counts and medians) averaged per day.
+    keys = [column for column in daily.columns if column != 'Date' and not pd.api.types.is_numeric_dtype(daily[column])]
+    metrics = [column for column in daily.columns if column != 'Date' and column not in keys]
+    aggregates = {column: 'sum' if column in SUMS else EXTREMES.get(column, 'mean') for column in metrics}
+
+    periods = daily.assign(Date=daily['Date'].dt.to_period(RESOLUTIONS[resolution]).dt.start_time)
+    groups = periods.groupby(['Date'] + keys, observed=True, sort=False)
+    data = groups.agg(aggregates)
+    data['Days'] = groups.size()
+    data['Seconds'] = data['Days'] * 24 * 60 * 60
+    for column, numerator, denominator in RATIOS:
+        if column in data and numerator in data and denominator in data:
+            data[column] = data[numerator] / data[denominator]
+    data = data.reset_index()[list(daily.columns) + ['Days']]
+    return data.sort_values('Date', ascending=False, kind='stable', ignore_index=True)
+
+
+def per_day(data):
+    # A rollup with its sums turned into averages per day, on the same scale as the daily values
+    return data.assign(**{column: data[column] / data['Days'] for column in SUMS if column in data})
+
+
+def resolution(daily, points=MAX_POINTS):
+    # Finest resolution that draws at most the given number of points per series over the whole history
+    periods = daily['Date'].drop_duplicates()
+    if len(periods) <= points:
+        return 'Daily'
+    for name, period in RESOLUTIONS.items():
+        if periods.dt.to_period(period).nunique() <= points:
+            return name
+    return name
+
+
+@per_frame
+def _rolled_up(daily, points):
+    # None when the rows are drawn daily: the memo must not hold on to the frame it is keyed on
+    name = resolution(daily, points)
+    return None if name == 'Daily' else per_day(rollup(daily, name))
+
+
+def rolled_up(daily, points=MAX_POINTS):
+    # The daily dataset at the resolution picked for it, as daily averages so the daily charts keep their meaning
+    rolled = _rolled_up(daily, points)
+    return daily if rolled is None else rolled
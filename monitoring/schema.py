@@ -0,0 +1,77 @@
+# Libraries
+import pandas as pd
+
+# Column kinds: low-cardinality labels are held as categoricals, counts in the smallest fitting
+# integer type and dates as datetime64. Columns that are not declared keep their loaded type.
+LABEL = 'label'
+COUNT = 'count'
+DATE = 'date'
+
+_TRANSACTIONS = {'Blocks': COUNT, 'Transactions': COUNT, 'Users': COUNT}
+_TRANSFERS = {'Transfers': COUNT, 'Users': COUNT}
+_SWAPS = {'Swaps': COUNT, 'Swappers': COUNT}
+_NFTS = {'Sales': COUNT, 'Buyers': COUNT, 'NFTs': COUNT, 'Collections': COUNT}
+_OVERVIEW = {'Blockchain': LABEL, 'Days': COUNT}
+_DAILY = {'Blockchain': LABEL, 'Date': DATE}
+_HEATMAP = {'Blockchain': LABEL, 'Day': LABEL, 'Hour': COUNT}
+
+# How the metrics combine over several days, for the weekly and monthly rollups and the overviews rebuilt from
+# the history: the ones that add up, the extremes of the daily values, and the ratios derived again from those
+# as (column, numerator, denominator). Distinct counts (users, buyers, ...) and medians are none of them.
+SUMS = ['Blocks', 'Transactions', 'Fees', 'Transfers', 'Swaps', 'Sales', 'NFTs', 'Volume']
+EXTREMES = {'PriceMax': 'max', 'PriceFloor': 'min'}
+RATIOS = [
+    ('FeeAverage', 'Fees', 'Transactions'),
+    ('AmountAverage', 'Volume', 'Transfers'),
+    ('AmountAverage', 'Volume', 'Swaps'),
+    ('PriceAverage', 'Volume', 'Sales'),
+    ('Transactions/Block', 'Transactions', 'Blocks'),
+    ('Fees/Block', 'Fees', 'Blocks'),
+    ('TPS', 'Transactions', 'Seconds')
+]
+
+SCHEMAS = {
+    ('Transactions', 'Overview'): {**_OVERVIEW, **_TRANSACTIONS},
+    ('Transactions', 'Daily'): {**_DAILY, **_TRANSACTIONS},
+    ('Transactions', 'Heatmap'): {**_HEATMAP, **_TRANSACTIONS},
+    ('Transactions', 'Fee Payers'): {'Blockchain': LABEL},
+
+    ('Transfers', 'Overview'): {**_OVERVIEW, **_TRANSFERS},
+    ('Transfers', 'Daily'): {**_DAILY, **_TRANSFERS},
+    ('Transfers', 'Heatmap'): {**_HEATMAP, **_TRANSFERS},
+    ('Transfers', 'Distribution'): {'Blockchain': LABEL, 'Bucket': LABEL, **_TRANSFERS},
+    ('Transfers', 'Transferring Users'): {'Blockchain': LABEL, 'Transfers': COUNT},
+    ('Transfers', 'Wallet Types'): {'Blockchain': LABEL, 'Wallet': LABEL, **_TRANSFERS},
+
+    ('Swaps', 'Overview'): {**_OVERVIEW, **_SWAPS},
+    ('Swaps', 'Daily'): {**_DAILY, **_SWAPS},
+    ('Swaps', 'Heatmap'): {**_HEATMAP, **_SWAPS},
+    ('Swaps', 'DEXs Overview'): {**_OVERVIEW, 'DEX': LABEL, **_SWAPS},
+    ('Swaps', 'DEXs Daily'): {**_DAILY, 'DEX': LABEL, **_SWAPS},
+    ('Swaps', 'Types Overview'): {**_OVERVIEW, 'Type': LABEL, **_SWAPS},
+    ('Swaps', 'Types Daily'): {**_DAILY, 'Type': LABEL, **_SWAPS},
+    ('Swaps', 'Assets Overview'): {**_OVERVIEW, 'Asset': LABEL, **_SWAPS},
+    ('Swaps', 'Assets Daily'): {**_DAILY, 'Asset': LABEL, **_SWAPS},
+
+    ('NFTs', 'Overview'): {**_OVERVIEW, 'Marketplaces': COUNT, **_NFTS},
+    ('NFTs', 'Daily'): {**_DAILY, 'Marketplaces': COUNT, **_NFTS},
+    ('NFTs', 'Heatmap'): {**_HEATMAP, 'Marketplaces': COUNT, **_NFTS},
+    ('NFTs', 'Marketplaces Overview'): {'Blockchain': LABEL, 'Marketplace': LABEL, **_NFTS},
+    ('NFTs', 'Marketplaces Daily'): {**_DAILY, 'Marketplace': LABEL, **_NFTS},
+    ('NFTs', 'Collections Overview'): {'Blockchain': LABEL, 'Collection': LABEL, **_NFTS},
+    ('NFTs', 'Collections Daily'): {**_DAILY, 'Collection': LABEL, **_NFTS},
+}
+
+
+def apply_schema(data, dataset):
+    columns = {}
+    for column, kind in SCHEMAS.get(dataset, {}).items():
+        if column not in data.columns:
+            continue
+        if kind == LABEL:
+            columns[column] = data[column].astype('category')
+        elif kind == DATE:
+            columns[column] = pd.to_datetime(data[column])
+        elif kind == COUNT and pd.api.types.is_integer_dtype(data[column]):
+            columns[column] = pd.to_numeric(data[column], downcast='integer')
+    return data.assign(**columns)
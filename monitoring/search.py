@@ -0,0 +1,51 @@
+# Libraries
+import numpy as np
+
+from monitoring.index import partitions, ranking
+from monitoring.memo import per_frame
+
+# Rows on one page of an explorer table
+PAGE_SIZE = 25
+
+class Names:
+    # Lower case names of a column, also in sorted order, so a prefix search is two binary searches and a
+    # substring search one vectorized scan, without lower casing the names on every rerun
+    def __init__(self, data, column):
+        self.names = data[column].astype(str).str.lower().to_numpy(dtype=str)
+        self.order = np.argsort(self.names, kind='stable')
+        self.sorted = self.names[self.order]
+
+    def prefix(self, text):
+        # Rows whose name starts with the text, as a boolean mask
+        text = text.lower()
+        start, end = np.searchsorted(self.sorted, [text, text + '\U0010ffff'])
+        mask = np.zeros(len(self.names), dtype=bool)
+        mask[self.order[start:end]] = True
+        return mask
+
+    def contains(self, text):
+        # Rows whose name contains the text, as a boolean mask
+        return np.char.find(self.names, text.lower()) >= 0
+
+
+# Name indexes of the loaded datasets, one per column
+names = per_frame(Names)
+
+
+def search(data, values, metric, ascending=False, text='', prefix=False, column='Collection'):
+    # Row positions of the rows of the selected blockchains whose name contains, or starts with, the text,
+    # ordered by the metric with NaN last. Only positions are handled, rows are taken a page at a time.
+    order = ranking(data, metric).ascending if ascending else ranking(data, metric).order
+    mask = np.zeros(len(data), dtype=bool)
+    positions = partitions(data).positions
+    for value in values:
+        if value in positions:
+            mask[positions[value]] = True
+    if text:
+        mask &= names(data, column).prefix(text) if prefix else names(data, column).contains(text)
+    return order[mask[order]]
+
+
+def page(data, rows, number, size=PAGE_SIZE):
+    # Rows of the given page, counted from 1, of the row positions returned by search
+    return data.take(rows[(number - 1) * size:number * size])
@@ -0,0 +1,59 @@
+# Libraries
+import os
+import tempfile
+
+import pyarrow as pa
+
+# Datasets published by the dataset service as Arrow IPC files that the page processes memory-map, so every
+# worker of a host reads the same pages of memory instead of holding its own copy. /dev/shm keeps them in RAM.
+SHARED_DIR = os.environ.get(
+    'MONITORING_SHARED_DIR',
+    os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'cross_chain_monitoring')
+)
+
+
+def path(query_id):
+    return os.path.join(SHARED_DIR, f'{query_id}.arrow')
+
+
+def stamp(query_id):
+    # Changes whenever a new version of the dataset is published, None until the first one is
+    try:
+        return os.stat(path(query_id)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def publish(query_id, fetched_at, data):
+    # Writes to a temporary file first and replaces the published one, so readers never see a partial dataset
+    # and keep the version they mapped until they let it go
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    for position, column in enumerate(data.columns):
+        if data[column].dtype.kind == 'f':
+            # NaN stays a float value rather than becoming a null, so the column can be read without a copy
+            table = table.set_column(position, column, pa.array(data[column].to_numpy(), from_pandas=False))
+    table = table.replace_schema_metadata({**table.schema.metadata, b'fetched_at': str(fetched_at).encode()})
+
+    os.makedirs(SHARED_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=SHARED_DIR, suffix='.tmp')
+    os.close(fd)
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path(query_id))
+
+
+def read(query_id):
+    # Returns (fetched at, data) of the published dataset. Numeric columns without nulls and strings point into
+    # the mapped file rather than into memory of this process.
+    table = pa.ipc.open_file(pa.memory_map(path(query_id))).read_all()
+    fetched_at = float(table.schema.metadata[b'fetched_at'])
+    return fetched_at, table.to_pandas(split_blocks=True)
+
+
+# Runs the dataset service: python -m monitoring.shared
+# It loads every dataset from MONITORING_DATA_SOURCE, publishes it to MONITORING_SHARED_DIR and keeps it
+# refreshed, while the page processes run with MONITORING_DATA_SOURCE=shared.
+if __name__ == '__main__':
+    from monitoring import data
+
+    data.serve()
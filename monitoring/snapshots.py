@@ -0,0 +1,37 @@
+# Libraries
+import os
+
+import pandas as pd
+
+# Local CSV snapshots of the query results, e.g. Data/transfers_daily.csv for ('Transfers', 'Daily')
+SNAPSHOT_DIR = os.environ.get('MONITORING_SNAPSHOT_DIR', 'Data')
+
+
+def path(data_sector, data_type):
+    return os.path.join(SNAPSHOT_DIR, f'{data_sector}_{data_type}'.lower().replace(' ', '_') + '.csv')
+
+
+def read(data_sector, data_type):
+    if not os.path.exists(path(data_sector, data_type)):
+        raise FileNotFoundError(
+            f'No snapshot of {data_sector} {data_type} at {path(data_sector, data_type)}, '
+            'record it with MONITORING_DATA_SOURCE=record or python -m monitoring.snapshots'
+        )
+    data = pd.read_csv(path(data_sector, data_type))
+    if 'Date' in data.columns:
+        data['Date'] = pd.to_datetime(data['Date'])
+    return data
+
+
+def write(data_sector, data_type, data):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    data.to_csv(path(data_sector, data_type), index=False)
+
+
+# Records a fresh snapshot of every dataset: python -m monitoring.snapshots
+if __name__ == '__main__':
+    from monitoring.data import API_URL, QUERIES
+
+    for (data_sector, data_type), query_id in QUERIES.items():
+        write(data_sector, data_type, pd.read_json(API_URL.format(query_id)))
+        print(f'Recorded {path(data_sector, data_type)}')
@@ -0,0 +1,82 @@
+# Libraries
+import re
+import sys
+import threading
+
+from monitoring import data
+from monitoring.lazy import lazy_import
+
+# Only imported once a query runs, so pages that do not query pay nothing for it
+duckdb = lazy_import('duckdb')
+
+# Views joining the datasets of several sectors, defined over the dataset views
+VIEWS = {
+    # Activity of every blockchain and day across the sectors
+    'chain_days': '''
+        SELECT
+            Blockchain, Date,
+            transactions.Transactions, transactions.Users AS TransactionUsers, transactions.Fees,
+            transfers.Transfers, transfers.Users AS TransferUsers, transfers.Volume AS TransferVolume,
+            swaps.Swaps, swaps.Swappers, swaps.Volume AS SwapVolume,
+            nfts.Sales, nfts.Buyers, nfts.Volume AS NFTVolume
+        FROM transactions_daily AS transactions
+        FULL JOIN transfers_daily AS transfers USING (Blockchain, Date)
+        FULL JOIN swaps_daily AS swaps USING (Blockchain, Date)
+        FULL JOIN nfts_daily AS nfts USING (Blockchain, Date)
+    '''
+}
+
+_connection = None
+_lock = threading.Lock()
+
+# Frame registered under each dataset view: view name -> frame
+_registered = {}
+
+# Joining views defined on the connection, which resolve the dataset views by name whenever they run
+_defined = set()
+
+
+def view_name(data_sector, data_type):
+    # Name of a dataset in SQL, e.g. transfers_daily for ('Transfers', 'Daily'), as its snapshot is named
+    return f'{data_sector}_{data_type}'.lower().replace(' ', '_')
+
+
+def _views(sql):
+    # Joining views a query reads
+    return [name for name in VIEWS if re.search(rf'\b{name}\b', sql)]
+
+
+def _datasets(sql):
+    # Datasets a query reads, directly or through the views joining them
+    sql += ''.join(VIEWS[name] for name in _views(sql))
+    return [dataset for dataset in data.QUERIES if re.search(rf'\b{view_name(*dataset)}\b', sql)]
+
+
+def query(sql, params=None):
+    # Result of a SQL query over the datasets as the pages are served them, run in process by DuckDB, e.g.
+    # query('SELECT Blockchain, SUM(Volume) AS Volume FROM swaps_daily WHERE Date >= ? GROUP BY 1', ['2022-12-01'])
+    # The datasets it reads are loaded like a page loads them and scanned in place, without a copy, and only
+    # the result becomes a DataFrame.
+    global _connection
+    frames = {view_name(*dataset): data.get_data(*dataset) for dataset in _datasets(sql)}
+    with _lock:
+        if _connection is None:
+            _connection = duckdb.connect()
+        for name, frame in frames.items():
+            # A refreshed dataset replaces the frame behind its view
+            if _registered.get(name) is not frame:
+                _connection.register(name, frame)
+                _registered[name] = frame
+        for name in _views(sql):
+            if name not in _defined:
+                _connection.execute(f'CREATE VIEW {name} AS {VIEWS[name]}')
+                _defined.add(name)
+        return _connection.execute(sql, params).df()
+
+
+# Runs a query and prints its result: python -m monitoring.sql "SELECT * FROM chain_days LIMIT 10"
+if __name__ == '__main__':
+    import pandas as pd
+
+    pd.set_option('display.width', None)
+    print(query(' '.join(sys.argv[1:])).to_string(index=False))
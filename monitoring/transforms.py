@@ -0,0 +1,18 @@
+# Libraries
+import numpy as np
+import pandas as pd
+
+
+def shares(data, index, column, metrics, groups=None):
+    # Percentage share of every group of a column in each index value, for several metrics at once.
+    # Returns a frame with (metric, group) columns, e.g. shares(...)['Volume'] is a date x chain table.
+    if groups is None:
+        groups = data[column].unique()
+    groups = list(dict.fromkeys(groups))
+    table = data.pivot_table(index=index, columns=column, values=metrics, aggfunc='sum', observed=True)
+    table = table.reindex(columns=pd.MultiIndex.from_product([metrics, groups]), fill_value=0).fillna(0)
+
+    values = table.to_numpy(dtype=float).reshape(len(table), len(metrics), len(groups))
+    totals = values.sum(axis=2, keepdims=True)
+    values = np.divide(100 * values, totals, out=np.zeros_like(values), where=totals != 0)
+    return pd.DataFrame(values.reshape(len(table), -1), index=table.index, columns=table.columns)
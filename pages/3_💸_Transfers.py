@@ -1,9 +1,18 @@
 # Libraries
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.subplots as sp
+from monitoring.charts import cached_figure, heatmap_chart, share_chart
+from monitoring.cubes import cube
+from monitoring.data import load_data
+from monitoring.debug import debug_sidebar
+from monitoring.heatmaps import heatmap
+from monitoring.index import select
+from monitoring.lazy import lazy_import
+from monitoring.rollups import rolled_up
+from monitoring.transforms import shares
+
+px = lazy_import('plotly.express')
+go = lazy_import('plotly.graph_objects')
+sp = lazy_import('plotly.subplots')
 
 # Layout
 st.set_page_config(page_title='USDC Transfers - Cross Chain Monitoring', page_icon=':bar_chart:', layout='wide')
@@ -14,29 +23,14 @@ with open('style.css')as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html = True)
 
 # Data Sources
-@st.cache(ttl=600)
-def get_data(data_sector, data_type):
-    if data_sector == 'Transfers':
-        if data_type == 'Overview':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/41eb418f-d231-4a1f-a1c8-e7cc0ff2fddb/data/latest')
-        elif data_type == 'Daily':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/76276234-81ba-44fd-8341-7cde62d30abc/data/latest')
-        elif data_type == 'Heatmap':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/933b930f-b611-469e-9e03-b0d5c5b0242b/data/latest')
-        elif data_type == 'Distribution':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/a17c8548-2834-4600-bc78-a0efb6d12de4/data/latest')
-        elif data_type == 'Transferring Users':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/2f9e94d0-79b9-49a5-be9a-eb289e9890d4/data/latest')
-        elif data_type == 'Wallet Types':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/cc07b022-fd08-459f-a9a3-cf8082221414/data/latest')
-    return None
-
-transfers_overview = get_data('Transfers', 'Overview')
-transfers_daily = get_data('Transfers', 'Daily')
-transfers_heatmap = get_data('Transfers', 'Heatmap')
-transfers_distribution = get_data('Transfers', 'Distribution')
-transfers_transferring_users = get_data('Transfers', 'Transferring Users')
-transfers_wallet_types = get_data('Transfers', 'Wallet Types')
+transfers_overview, transfers_daily, transfers_heatmap, transfers_distribution, transfers_transferring_users, transfers_wallet_types = load_data(
+    ('Transfers', 'Overview'),
+    ('Transfers', 'Daily'),
+    ('Transfers', 'Heatmap'),
+    ('Transfers', 'Distribution'),
+    ('Transfers', 'Transferring Users'),
+    ('Transfers', 'Wallet Types'),
+)
 
 # Filter the blockchains
 options = st.multiselect(
@@ -53,7 +47,7 @@ if len(options) == 0:
 # Single chain Analysis
 elif len(options) == 1:
     st.subheader('Overview')
-    df = transfers_overview.query("Blockchain == @options")
+    df = select(transfers_overview, options)
     c1, c2, c3, c4 = st.columns(4)
     with c1:
         st.metric(label='Volume', value=df['Volume'].round(), help='USD')
@@ -69,334 +63,363 @@ elif len(options) == 1:
         st.metric(label='Median Amount', value=df['AmountMedian'].round(2), help='USD')
     
     st.subheader('Distribution')
-    df = transfers_distribution.query("Blockchain == @options")
+    df = select(transfers_distribution, options)
     c1, c2, c3 = st.columns(3)
     with c1:
-        fig = px.pie(df, values='Volume', names='Bucket', title='Share of Total Transferred Volume')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Volume', names='Bucket', title='Share of Total Transferred Volume')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
     with c2:
-        fig = px.pie(df, values='Transfers', names='Bucket', title='Share of Total Transfers')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Transfers', names='Bucket', title='Share of Total Transfers')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
     with c3:
-        fig = px.pie(df, values='Users', names='Bucket', title='Share of Total Transferring Users')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Users', names='Bucket', title='Share of Total Transferring Users')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
     st.subheader('Activity Over Time')
-    df = transfers_daily.query("Blockchain == @options")
+    df = select(rolled_up(transfers_daily), options)
 
-    fig = px.area(df, x='Date', y='Volume', title='Daily Transferred Volume')
-    fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+    fig = cached_figure(options, lambda: (
+        px.area(df, x='Date', y='Volume', title='Daily Transferred Volume')
+        .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+    ))
     st.plotly_chart(fig, use_container_width=True)
 
     c1, c2 = st.columns(2)
     with c1:
-        fig = sp.make_subplots(specs=[[{'secondary_y': True}]])
-        fig.add_trace(go.Bar(x=df['Date'], y=df['Transfers'], name='Transfers'), secondary_y=False)
-        fig.add_trace(go.Line(x=df['Date'], y=df['Users'], name='Users'), secondary_y=True)
-        fig.update_layout(title_text='Daily Transfers and Transferring Users')
-        fig.update_yaxes(title_text='Transfers', secondary_y=False)
-        fig.update_yaxes(title_text='Users', secondary_y=True)
+        fig = cached_figure(options, lambda: (
+            sp.make_subplots(specs=[[{'secondary_y': True}]])
+            .add_trace(go.Bar(x=df['Date'], y=df['Transfers'], name='Transfers'), secondary_y=False)
+            .add_trace(go.Line(x=df['Date'], y=df['Users'], name='Users'), secondary_y=True)
+            .update_layout(title_text='Daily Transfers and Transferring Users')
+            .update_yaxes(title_text='Transfers', secondary_y=False)
+            .update_yaxes(title_text='Users', secondary_y=True)
+        ))
         st.plotly_chart(fig, use_container_width=True)
     with c2:
-        fig = sp.make_subplots(specs=[[{'secondary_y': True}]])
-        fig.add_trace(go.Bar(x=df['Date'], y=df['AmountAverage'], name='Average'), secondary_y=False)
-        fig.add_trace(go.Line(x=df['Date'], y=df['AmountMedian'], name='Median'), secondary_y=True)
-        fig.update_layout(title_text='Daily Average and Median Transferred Amount')
-        fig.update_yaxes(title_text='Average', secondary_y=False)
-        fig.update_yaxes(title_text='Median', secondary_y=True)
+        fig = cached_figure(options, lambda: (
+            sp.make_subplots(specs=[[{'secondary_y': True}]])
+            .add_trace(go.Bar(x=df['Date'], y=df['AmountAverage'], name='Average'), secondary_y=False)
+            .add_trace(go.Line(x=df['Date'], y=df['AmountMedian'], name='Median'), secondary_y=True)
+            .update_layout(title_text='Daily Average and Median Transferred Amount')
+            .update_yaxes(title_text='Average', secondary_y=False)
+            .update_yaxes(title_text='Median', secondary_y=True)
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
     st.subheader('Activity Heatmap')
-    df = transfers_heatmap.query("Blockchain == @options")
+    df_heatmap = heatmap(transfers_heatmap, options[0])
     c1, c2 = st.columns(2)
     with c1:
-        fig = px.scatter(df, x='Hour', y='Day', size='Volume', color='Volume', title='Heatmap of Transferred Volume')
-        fig.update_layout(xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['Volume'], 'Heatmap of Transferred Volume'))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.scatter(df, x='Hour', y='Day', size='AmountAverage', color='AmountAverage', title='Heatmap of Average Transferred Amount')
-        fig.update_layout(xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['AmountAverage'], 'Heatmap of Average Transferred Amount'))
         st.plotly_chart(fig, use_container_width=True)
     with c2:
-        fig = px.scatter(df, x='Hour', y='Day', size='Transfers', color='Transfers', title='Heatmap of Transfers')
-        fig.update_layout(xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['Transfers'], 'Heatmap of Transfers'))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.scatter(df, x='Hour', y='Day', size='Users', color='Users', title='Heatmap of Transferring Users')
-        fig.update_layout(xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['Users'], 'Heatmap of Transferring Users'))
         st.plotly_chart(fig, use_container_width=True)
 
     st.subheader('Wallet Types of Transferring Users')
-    df = transfers_wallet_types.query('Blockchain == @options')
+    df = select(transfers_wallet_types, options)
     c1, c2, c3 = st.columns(3)
     with c1:
-        fig = px.bar(df, x='Wallet', y='Volume', color='Wallet', title='Total Transferred Volume of Each Wallet Type')
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
-        fig.update_xaxes(type='category')
+        fig = cached_figure(options, lambda: (
+            px.bar(df, x='Wallet', y='Volume', color='Wallet', title='Total Transferred Volume of Each Wallet Type')
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
+            .update_xaxes(type='category')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.pie(df, values='Volume', names='Wallet', title='Share of Total Transferred Volume of Each Wallet Type')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Volume', names='Wallet', title='Share of Total Transferred Volume of Each Wallet Type')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
     with c2:
-        fig = px.bar(df, x='Wallet', y='Transfers', color='Wallet', title='Total Transfers of Each Wallet Type')
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
-        fig.update_xaxes(type='category')
+        fig = cached_figure(options, lambda: (
+            px.bar(df, x='Wallet', y='Transfers', color='Wallet', title='Total Transfers of Each Wallet Type')
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
+            .update_xaxes(type='category')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.pie(df, values='Transfers', names='Wallet', title='Share of Total Transfers of Each Wallet Type')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Transfers', names='Wallet', title='Share of Total Transfers of Each Wallet Type')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
     with c3:
-        fig = px.bar(df, x='Wallet', y='Users', color='Wallet', title='Total Transferring Users of Each Wallet Type')
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
-        fig.update_xaxes(type='category')
+        fig = cached_figure(options, lambda: (
+            px.bar(df, x='Wallet', y='Users', color='Wallet', title='Total Transferring Users of Each Wallet Type')
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
+            .update_xaxes(type='category')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.pie(df, values='Users', names='Wallet', title='Share of Total Transferring Users of Each Wallet Type')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Users', names='Wallet', title='Share of Total Transferring Users of Each Wallet Type')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
     st.subheader('Top Transferring Users')
-    df = transfers_transferring_users.query("Blockchain == @options")
+    df = select(transfers_transferring_users, options)
     c1, c2 = st.columns(2)
     with c1:
-        fig = px.bar(df, x='User', y='Transfers', color='User', title='Total Transfers By Top Transferring Users')
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
-        fig.update_xaxes(type='category')
+        fig = cached_figure(options, lambda: (
+            px.bar(df, x='User', y='Transfers', color='User', title='Total Transfers By Top Transferring Users')
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
+            .update_xaxes(type='category')
+        ))
         st.plotly_chart(fig, use_container_width=True)
     with c2:
-        fig = px.bar(df, x='User', y='Volume', color='User', title='Total Transferred Volume By Top Transferring Users')
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
-        fig.update_xaxes(type='category')
+        fig = cached_figure(options, lambda: (
+            px.bar(df, x='User', y='Volume', color='User', title='Total Transferred Volume By Top Transferring Users')
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
+            .update_xaxes(type='category')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
 # Cross Chain Comparison
 else:
-    subtab_overview, subtab_amounts, subtab_heatmap, subtab_distribution = st.tabs(['Overview', 'Amounts', 'Heatmap', 'Distribution'])
-
-    with subtab_overview:
-        st.subheader('Overview')
-        df = transfers_overview.query("Blockchain == @options")
-        c1, c2, c3 = st.columns(3)
-        with c1:
-            fig = px.bar(df, x='Blockchain', y='Volume', color='Blockchain', title='Total Transferred Volume', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Transfers', color='Blockchain', title='Total Transfers', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Users', color='Blockchain', title='Total Transferring Users', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-        with c2:
-            fig = px.pie(df, values='Volume', names='Blockchain', title='Share of Total Transferred Volume')
-            fig.update_layout(showlegend=False)
-            fig.update_traces(textinfo='percent+label', textposition='inside')
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.pie(df, values='Transfers', names='Blockchain', title='Share of Total Transfers')
-            fig.update_layout(showlegend=False)
-            fig.update_traces(textinfo='percent+label', textposition='inside')
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.pie(df, values='Users', names='Blockchain', title='Share of Total Transferring Users')
-            fig.update_layout(showlegend=False)
-            fig.update_traces(textinfo='percent+label', textposition='inside')
-            st.plotly_chart(fig, use_container_width=True)
-        with c3:
-            fig = px.bar(df, x='Blockchain', y='Volume/Day', color='Blockchain', title='Average Transferred Volume/Day', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Transfers/Day', color='Blockchain', title='Average Transfers/Day', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Users/Day', color='Blockchain', title='Average Transferring Users/Day', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-        st.subheader('Transfers Over Time')
-        df = transfers_daily.query("Blockchain == @options")
-        c1, c2 = st.columns(2)
-        with c1:
-            fig = px.line(df, x='Date', y='Volume', color='Blockchain', title='Daily Transferred Volume', log_y=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.line(df, x='Date', y='Transfers', color='Blockchain', title='Daily Transfers', log_y=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.line(df, x='Date', y='Users', color='Blockchain', title='Daily Transferring Users', log_y=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-        with c2:
-            fig = go.Figure()
-            for i in options:
-                fig.add_trace(go.Scatter(
-                    name=i,
-                    x=df.query("Blockchain == @i")['Date'],
-                    y=df.query("Blockchain == @i")['Volume'],
-                    mode='lines',
-                    stackgroup='one',
-                    groupnorm='percent'
+    subtab_overview, subtab_amounts, subtab_heatmap, subtab_distribution = st.tabs(['Overview', 'Amounts', 'Heatmap', 'Distribution'], key='transfers_tab', on_change='rerun')
+
+    if subtab_overview.open:
+        with subtab_overview:
+            st.subheader('Overview')
+            df = select(transfers_overview, options)
+            c1, c2, c3 = st.columns(3)
+            with c1:
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Volume', color='Blockchain', title='Total Transferred Volume', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Transfers', color='Blockchain', title='Total Transfers', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Users', color='Blockchain', title='Total Transferring Users', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+            with c2:
+                fig = cached_figure(options, lambda: (
+                    px.pie(df, values='Volume', names='Blockchain', title='Share of Total Transferred Volume')
+                    .update_layout(showlegend=False)
+                    .update_traces(textinfo='percent+label', textposition='inside')
                 ))
-            fig.update_layout(title='Daily Share of Transferred Volume')
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.pie(df, values='Transfers', names='Blockchain', title='Share of Total Transfers')
+                    .update_layout(showlegend=False)
+                    .update_traces(textinfo='percent+label', textposition='inside')
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.pie(df, values='Users', names='Blockchain', title='Share of Total Transferring Users')
+                    .update_layout(showlegend=False)
+                    .update_traces(textinfo='percent+label', textposition='inside')
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+            with c3:
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Volume/Day', color='Blockchain', title='Average Transferred Volume/Day', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Transfers/Day', color='Blockchain', title='Average Transfers/Day', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Users/Day', color='Blockchain', title='Average Transferring Users/Day', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+            st.subheader('Transfers Over Time')
+            df = select(rolled_up(transfers_daily), options)
+            c1, c2 = st.columns(2)
+            with c1:
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='Volume', color='Blockchain', title='Daily Transferred Volume', log_y=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='Transfers', color='Blockchain', title='Daily Transfers', log_y=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='Users', color='Blockchain', title='Daily Transferring Users', log_y=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+            with c2:
+                df_shares = cube(rolled_up(transfers_daily)).shares(options, ['Volume', 'Transfers', 'Users'])
+
+                fig = cached_figure(options, lambda: share_chart(df_shares['Volume'], 'Daily Share of Transferred Volume'))
+                st.plotly_chart(fig, use_container_width=True)
             
-            fig = go.Figure()
-            for i in options:
-                fig.add_trace(go.Scatter(
-                    name=i,
-                    x=df.query("Blockchain == @i")['Date'],
-                    y=df.query("Blockchain == @i")['Transfers'],
-                    mode='lines',
-                    stackgroup='one',
-                    groupnorm='percent'
+                fig = cached_figure(options, lambda: share_chart(df_shares['Transfers'], 'Daily Share of Transfers'))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: share_chart(df_shares['Users'], 'Daily Share of Transferring Users'))
+                st.plotly_chart(fig, use_container_width=True)
+
+    if subtab_amounts.open:
+        with subtab_amounts:
+            st.subheader("Transferred Amount")
+            c1, c2 = st.columns([1, 2])
+            with c1:
+                df = select(transfers_overview, options)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(transfers_overview, x='Blockchain', y='AmountAverage', color='Blockchain', title='Average Transferred Amount', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
                 ))
-            fig.update_layout(title='Daily Share of Transfers')
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = go.Figure()
-            for i in options:
-                fig.add_trace(go.Scatter(
-                    name=i,
-                    x=df.query("Blockchain == @i")['Date'],
-                    y=df.query("Blockchain == @i")['Users'],
-                    mode='lines',
-                    stackgroup='one',
-                    groupnorm='percent'
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(transfers_overview, x='Blockchain', y='AmountMedian', color='Blockchain', title='Median Transferred Amount', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
                 ))
-            fig.update_layout(title='Daily Share of Transferring Users')
-            st.plotly_chart(fig, use_container_width=True)
-
-    with subtab_amounts:
-        st.subheader("Transferred Amount")
-        c1, c2 = st.columns([1, 2])
-        with c1:
-            df = transfers_overview.query("Blockchain == @options")
-
-            fig = px.bar(transfers_overview, x='Blockchain', y='AmountAverage', color='Blockchain', title='Average Transferred Amount', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(transfers_overview, x='Blockchain', y='AmountMedian', color='Blockchain', title='Median Transferred Amount', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
         
-        with c2:
-            df = transfers_daily.query("Blockchain == @options")
-
-            fig = px.line(df, x='Date', y='AmountAverage', color='Blockchain', title='Daily Average Transferred Amount')
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.line(df, x='Date', y='AmountMedian', color='Blockchain', title='Daily Median Transferred Amount')
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-    with subtab_heatmap:
-        st.subheader('Daily and Hourly Heatmap of Transfers')
-        c1, c2 = st.columns(2)
-        df = transfers_heatmap.query('Blockchain == @options')
-        with c1:
-            fig = px.scatter(df, x='Volume', y='Day', color='Blockchain', title='Daily Heatmap of Transferred Volume', log_x=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='Transfers', y='Day', color='Blockchain', title='Daily Heatmap of Transfers', log_x=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='Users', y='Day', color='Blockchain', title='Daily Heatmap of Transferring Users', log_x=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='AmountAverage', y='Day', color='Blockchain', title='Daily Heatmap of Average Transferred Amount', log_x=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-        with c2:
-            fig = px.scatter(df, x='Volume', y='Hour', color='Blockchain', title='Hourly Heatmap of Transferred Volume', log_x=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='Transfers', y='Hour', color='Blockchain', title='Hourly Heatmap of Transfers', log_x=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='Users', y='Hour', color='Blockchain', title='Hourly Heatmap of Transferring Users', log_x=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='AmountAverage', y='Hour', color='Blockchain', title='Hourly Heatmap of Average Transferred Amount', log_x=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-    with subtab_distribution:
-        st.subheader('Transferred Amount Size Distribution')
-        c1, c2 = st.columns(2)
-        df = transfers_distribution.query("Blockchain == @options").sort_values(['Blockchain', 'Bucket'])
-        with c1:
-            fig = px.bar(df, x='Blockchain', y='Volume', color='Bucket', title='Total Transferred Volume of Each Group')
-            fig.update_layout(xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Transfers', color='Bucket', title='Total Transfers of Each Group')
-            fig.update_layout(xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Users', color='Bucket', title='Total Transferring Users of Each Group')
-            fig.update_layout(xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-        with c2:
-            fig = go.Figure()
-            for i in df['Bucket'].unique():
-                fig.add_trace(go.Scatter(
-                    name=i,
-                    x=df.query("Bucket == @i")['Blockchain'],
-                    y=df.query("Bucket == @i")['Volume'],
-                    mode='lines',
-                    stackgroup='one',
-                    groupnorm='percent'
+            with c2:
+                df = select(rolled_up(transfers_daily), options)
+
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='AmountAverage', color='Blockchain', title='Daily Average Transferred Amount')
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
                 ))
-            fig.update_layout(title='Share of Total Transferred Volume of Each Group')
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = go.Figure()
-            for i in df['Bucket'].unique():
-                fig.add_trace(go.Scatter(
-                    name=i,
-                    x=df.query("Bucket == @i")['Blockchain'],
-                    y=df.query("Bucket == @i")['Transfers'],
-                    mode='lines',
-                    stackgroup='one',
-                    groupnorm='percent'
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='AmountMedian', color='Blockchain', title='Daily Median Transferred Amount')
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+    if subtab_heatmap.open:
+        with subtab_heatmap:
+            st.subheader('Daily and Hourly Heatmap of Transfers')
+            c1, c2 = st.columns(2)
+            df = select(transfers_heatmap, options)
+            with c1:
+                fig = cached_figure(options, lambda: (
+                    px.scatter(df, x='Volume', y='Day', color='Blockchain', title='Daily Heatmap of Transferred Volume', log_x=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.scatter(df, x='Transfers', y='Day', color='Blockchain', title='Daily Heatmap of Transfers', log_x=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.scatter(df, x='Users', y='Day', color='Blockchain', title='Daily Heatmap of Transferring Users', log_x=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
                 ))
-            fig.update_layout(title='Share of Total Transfers of Each Group')
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = go.Figure()
-            for i in df['Bucket'].unique():
-                fig.add_trace(go.Scatter(
-                    name=i,
-                    x=df.query("Bucket == @i")['Blockchain'],
-                    y=df.query("Bucket == @i")['Users'],
-                    mode='lines',
-                    stackgroup='one',
-                    groupnorm='percent'
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.scatter(df, x='AmountAverage', y='Day', color='Blockchain', title='Daily Heatmap of Average Transferred Amount', log_x=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+            with c2:
+                fig = cached_figure(options, lambda: (
+                    px.scatter(df, x='Volume', y='Hour', color='Blockchain', title='Hourly Heatmap of Transferred Volume', log_x=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.scatter(df, x='Transfers', y='Hour', color='Blockchain', title='Hourly Heatmap of Transfers', log_x=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.scatter(df, x='Users', y='Hour', color='Blockchain', title='Hourly Heatmap of Transferring Users', log_x=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
                 ))
-            fig.update_layout(title='Share of Total Transferring Users of Each Group')
-            st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.scatter(df, x='AmountAverage', y='Hour', color='Blockchain', title='Hourly Heatmap of Average Transferred Amount', log_x=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+    if subtab_distribution.open:
+        with subtab_distribution:
+            st.subheader('Transferred Amount Size Distribution')
+            c1, c2 = st.columns(2)
+            df = select(transfers_distribution, options).sort_values(['Blockchain', 'Bucket'])
+            with c1:
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Volume', color='Bucket', title='Total Transferred Volume of Each Group')
+                    .update_layout(xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Transfers', color='Bucket', title='Total Transfers of Each Group')
+                    .update_layout(xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Users', color='Bucket', title='Total Transferring Users of Each Group')
+                    .update_layout(xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+            with c2:
+                df_shares = shares(df, 'Blockchain', 'Bucket', ['Volume', 'Transfers', 'Users'])
+
+                fig = cached_figure(options, lambda: share_chart(df_shares['Volume'], 'Share of Total Transferred Volume of Each Group'))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: share_chart(df_shares['Transfers'], 'Share of Total Transfers of Each Group'))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: share_chart(df_shares['Users'], 'Share of Total Transferring Users of Each Group'))
+                st.plotly_chart(fig, use_container_width=True)
+
+# Timings
+debug_sidebar(__file__)
\ No newline at end of file
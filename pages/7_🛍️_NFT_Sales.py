@@ -1,9 +1,17 @@
 # Libraries
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.subplots as sp
+from monitoring.charts import cached_figure, heatmap_chart, share_chart
+from monitoring.cubes import cube
+from monitoring.data import load_data
+from monitoring.debug import debug_sidebar
+from monitoring.heatmaps import heatmap
+from monitoring.index import select
+from monitoring.lazy import lazy_import
+from monitoring.rollups import rolled_up
+
+px = lazy_import('plotly.express')
+go = lazy_import('plotly.graph_objects')
+sp = lazy_import('plotly.subplots')
 
 # Layout
 st.set_page_config(page_title='NFTs - Cross Chain Monitoring', page_icon=':bar_chart:', layout='wide')
@@ -14,26 +22,11 @@ with open('style.css')as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html = True)
 
 # Data Sources
-@st.cache(ttl=600)
-def get_data(data_sector, data_type):
-    if data_sector == 'NFTs':
-        if data_type == 'Overview':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/a9dee9b9-bfd8-4fed-b49b-a03767306d89/data/latest')
-        elif data_type == 'Daily':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/6ec4aca1-3d25-4233-bec2-0443b27d3e6c/data/latest')
-        elif data_type == 'Heatmap':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/62fa2182-ca1b-4648-a363-8d1ce591253e/data/latest')
-        elif data_type == 'Marketplaces Overview':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/8f4e8520-52af-4d57-b29e-e513f62f8fa9/data/latest')
-        elif data_type == 'Marketplaces Daily':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/8fcca211-4bc6-444d-8696-0a583e2966a6/data/latest')
-    return None
-
-nfts_overview = get_data('NFTs', 'Overview')
-nfts_daily = get_data('NFTs', 'Daily')
-nfts_heatmap = get_data('NFTs', 'Heatmap')
-nfts_marketplaces_overview = get_data('NFTs', 'Marketplaces Overview')
-nfts_marketplaces_daily = get_data('NFTs', 'Marketplaces Daily')
+nfts_overview, nfts_daily, nfts_heatmap = load_data(
+    ('NFTs', 'Overview'),
+    ('NFTs', 'Daily'),
+    ('NFTs', 'Heatmap'),
+)
 
 # Filter the blockchains
 options = st.multiselect(
@@ -50,7 +43,7 @@ if len(options) == 0:
 # Single chain Analysis
 elif len(options) == 1:
     st.subheader('Overview')
-    df = nfts_overview.query('Blockchain == @options')
+    df = select(nfts_overview, options)
     c1, c2, c3, c4, c5, c6 = st.columns(6)
     with c1:
         st.metric(label='Volume', value=df['Volume'].round(), help='USD')
@@ -78,296 +71,310 @@ elif len(options) == 1:
         st.metric(label='NFTs/Collection', value=df['NFTs/Collection'].round())
 
     st.subheader('Sales Over Time')
-    df = nfts_daily.query('Blockchain == @options')
+    df = select(rolled_up(nfts_daily), options)
     c1, c2 = st.columns(2)
     with c1:
-        fig = px.area(df, x='Date', y='Volume', title='Daily Sales Volume')
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: (
+            px.area(df, x='Date', y='Volume', title='Daily Sales Volume')
+            .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = sp.make_subplots(specs=[[{'secondary_y': True}]])
-        fig.add_trace(go.Bar(x=df['Date'], y=df['PriceAverage'], name='Average'), secondary_y=False)
-        fig.add_trace(go.Line(x=df['Date'], y=df['PriceMedian'], name='Median'), secondary_y=True)
-        fig.update_layout(title_text='Daily Average and Median NFT Prices')
-        fig.update_yaxes(title_text='Average', secondary_y=False)
-        fig.update_yaxes(title_text='Median', secondary_y=True)
+        fig = cached_figure(options, lambda: (
+            sp.make_subplots(specs=[[{'secondary_y': True}]])
+            .add_trace(go.Bar(x=df['Date'], y=df['PriceAverage'], name='Average'), secondary_y=False)
+            .add_trace(go.Line(x=df['Date'], y=df['PriceMedian'], name='Median'), secondary_y=True)
+            .update_layout(title_text='Daily Average and Median NFT Prices')
+            .update_yaxes(title_text='Average', secondary_y=False)
+            .update_yaxes(title_text='Median', secondary_y=True)
+        ))
         st.plotly_chart(fig, use_container_width=True)
     with c2:
-        fig = sp.make_subplots(specs=[[{'secondary_y': True}]])
-        fig.add_trace(go.Bar(x=df['Date'], y=df['Sales'], name='Sales'), secondary_y=False)
-        fig.add_trace(go.Line(x=df['Date'], y=df['Buyers'], name='Buyers'), secondary_y=True)
-        fig.update_layout(title_text='Daily Sales and Buyers')
-        fig.update_yaxes(title_text='Sales', secondary_y=False)
-        fig.update_yaxes(title_text='Buyers', secondary_y=True)
+        fig = cached_figure(options, lambda: (
+            sp.make_subplots(specs=[[{'secondary_y': True}]])
+            .add_trace(go.Bar(x=df['Date'], y=df['Sales'], name='Sales'), secondary_y=False)
+            .add_trace(go.Line(x=df['Date'], y=df['Buyers'], name='Buyers'), secondary_y=True)
+            .update_layout(title_text='Daily Sales and Buyers')
+            .update_yaxes(title_text='Sales', secondary_y=False)
+            .update_yaxes(title_text='Buyers', secondary_y=True)
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = sp.make_subplots(specs=[[{'secondary_y': True}]])
-        fig.add_trace(go.Bar(x=df['Date'], y=df['NFTs'], name='NFTs'), secondary_y=False)
-        fig.add_trace(go.Line(x=df['Date'], y=df['Collections'], name='Collections'), secondary_y=True)
-        fig.update_layout(title_text='Daily Traded NFTs and Collections')
-        fig.update_yaxes(title_text='NFTs', secondary_y=False)
-        fig.update_yaxes(title_text='Collections', secondary_y=True)
+        fig = cached_figure(options, lambda: (
+            sp.make_subplots(specs=[[{'secondary_y': True}]])
+            .add_trace(go.Bar(x=df['Date'], y=df['NFTs'], name='NFTs'), secondary_y=False)
+            .add_trace(go.Line(x=df['Date'], y=df['Collections'], name='Collections'), secondary_y=True)
+            .update_layout(title_text='Daily Traded NFTs and Collections')
+            .update_yaxes(title_text='NFTs', secondary_y=False)
+            .update_yaxes(title_text='Collections', secondary_y=True)
+        ))
         st.plotly_chart(fig, use_container_width=True)
         
     st.subheader('Activity Heatmap')
-    df = nfts_heatmap.query('Blockchain == @options')
+    df_heatmap = heatmap(nfts_heatmap, options[0])
     c1, c2 = st.columns(2)
     with c1:
-        fig = px.scatter(df, x='Hour', y='Day', size='Volume', color='Volume', title='Heatmap of Sales Volume')
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['Volume'], 'Heatmap of Sales Volume'))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.scatter(df, x='Hour', y='Day', size='PriceAverage', color='PriceAverage', title='Heatmap of Average NFT Price')
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['PriceAverage'], 'Heatmap of Average NFT Price'))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.scatter(df, x='Hour', y='Day', size='PriceMedian', color='PriceMedian', title='Heatmap of Median NFT Price')
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['PriceMedian'], 'Heatmap of Median NFT Price'))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.scatter(df, x='Hour', y='Day', size='PriceMax', color='PriceMax', title='Heatmap of Maximum NFT Price')
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['PriceMax'], 'Heatmap of Maximum NFT Price'))
         st.plotly_chart(fig, use_container_width=True)
     with c2:
-        fig = px.scatter(df, x='Hour', y='Day', size='Sales', color='Sales', title='Heatmap of Sales')
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['Sales'], 'Heatmap of Sales'))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.scatter(df, x='Hour', y='Day', size='Buyers', color='Buyers', title='Heatmap of Buyers')
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['Buyers'], 'Heatmap of Buyers'))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.scatter(df, x='Hour', y='Day', size='NFTs', color='Buyers', title='Heatmap of Traded NFTs')
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['NFTs'], 'Heatmap of Traded NFTs'))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.scatter(df, x='Hour', y='Day', size='Collections', color='Buyers', title='Heatmap of Traded Collections')
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: heatmap_chart(df_heatmap['Collections'], 'Heatmap of Traded Collections'))
         st.plotly_chart(fig, use_container_width=True)
 
 # Cross Chain Comparison
 else:
-    subtab_overview, subtab_prices, subtab_heatmap = st.tabs(['Overview', 'Prices', 'Heatmap'])
-    with subtab_overview:
-        st.subheader('Overview of Sales')
-        df = nfts_overview.query('Blockchain == @options')
-        c1, c2, c3 = st.columns(3)
-        with c1:
-            fig = px.bar(df, x='Blockchain', y='Volume', color='Blockchain', title='Total Sales Volume', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Sales', color='Blockchain', title='Total Sales', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Buyers', color='Blockchain', title='Total Buyers', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='NFTs', color='Blockchain', title='Total Traded NFTs', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Collections', color='Blockchain', title='Total Traded Collections', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-        with c2:
-            fig = px.pie(df, values='Volume', names='Blockchain', title='Share of Total Sales Volume')
-            fig.update_layout(showlegend=False)
-            fig.update_traces(textinfo='percent+label', textposition='inside')
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.pie(df, values='Sales', names='Blockchain', title='Share of Total Sales')
-            fig.update_layout(showlegend=False)
-            fig.update_traces(textinfo='percent+label', textposition='inside')
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.pie(df, values='Buyers', names='Blockchain', title='Share of Total Buyers')
-            fig.update_layout(showlegend=False)
-            fig.update_traces(textinfo='percent+label', textposition='inside')
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.pie(df, values='NFTs', names='Blockchain', title='Share of Total Traded NFTs')
-            fig.update_layout(showlegend=False)
-            fig.update_traces(textinfo='percent+label', textposition='inside')
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.pie(df, values='Collections', names='Blockchain', title='Share of Total Traded Collections')
-            fig.update_layout(showlegend=False)
-            fig.update_traces(textinfo='percent+label', textposition='inside')
-            st.plotly_chart(fig, use_container_width=True)
-
-        with c3:
-            fig = px.bar(df, x='Blockchain', y='Volume/Day', color='Blockchain', title='Average Volume/Day', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Sales/Day', color='Blockchain', title='Average Sales/Day', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Buyers/Day', color='Blockchain', title='Average Buyers/Day', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='NFTs/Day', color='Blockchain', title='Average NFTs/Day', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='Collections/Day', color='Blockchain', title='Average Collections/Day', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-            st.plotly_chart(fig, use_container_width=True)
+    subtab_overview, subtab_prices, subtab_heatmap = st.tabs(['Overview', 'Prices', 'Heatmap'], key='nft_sales_tab', on_change='rerun')
+    if subtab_overview.open:
+        with subtab_overview:
+            st.subheader('Overview of Sales')
+            df = select(nfts_overview, options)
+            c1, c2, c3 = st.columns(3)
+            with c1:
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Volume', color='Blockchain', title='Total Sales Volume', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Sales', color='Blockchain', title='Total Sales', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Buyers', color='Blockchain', title='Total Buyers', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='NFTs', color='Blockchain', title='Total Traded NFTs', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Collections', color='Blockchain', title='Total Traded Collections', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+            with c2:
+                fig = cached_figure(options, lambda: (
+                    px.pie(df, values='Volume', names='Blockchain', title='Share of Total Sales Volume')
+                    .update_layout(showlegend=False)
+                    .update_traces(textinfo='percent+label', textposition='inside')
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.pie(df, values='Sales', names='Blockchain', title='Share of Total Sales')
+                    .update_layout(showlegend=False)
+                    .update_traces(textinfo='percent+label', textposition='inside')
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.pie(df, values='Buyers', names='Blockchain', title='Share of Total Buyers')
+                    .update_layout(showlegend=False)
+                    .update_traces(textinfo='percent+label', textposition='inside')
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.pie(df, values='NFTs', names='Blockchain', title='Share of Total Traded NFTs')
+                    .update_layout(showlegend=False)
+                    .update_traces(textinfo='percent+label', textposition='inside')
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.pie(df, values='Collections', names='Blockchain', title='Share of Total Traded Collections')
+                    .update_layout(showlegend=False)
+                    .update_traces(textinfo='percent+label', textposition='inside')
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+            with c3:
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Volume/Day', color='Blockchain', title='Average Volume/Day', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Sales/Day', color='Blockchain', title='Average Sales/Day', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Buyers/Day', color='Blockchain', title='Average Buyers/Day', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='NFTs/Day', color='Blockchain', title='Average NFTs/Day', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='Collections/Day', color='Blockchain', title='Average Collections/Day', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
         
-        st.subheader('Sales Over Time')
-        df = nfts_daily.query('Blockchain == @options')
-        c1, c2 = st.columns(2)
-        with c1:
-            fig = px.line(df, x='Date', y='Volume', color='Blockchain', title='Daily Sales Volume', log_y=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.line(df, x='Date', y='Sales', color='Blockchain', title='Daily Sales', log_y=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            fig = px.line(df, x='Date', y='Buyers', color='Blockchain', title='Daily Buyers', log_y=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            fig = px.line(df, x='Date', y='NFTs', color='Blockchain', title='Daily Traded NFTs', log_y=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            fig = px.line(df, x='Date', y='Collections', color='Blockchain', title='Daily Traded Collections', log_y=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-        with c2:
-            fig = go.Figure()
-            for i in options:
-                fig.add_trace(go.Scatter(
-                    name=i,
-                    x=df.query("Blockchain == @i")['Date'],
-                    y=df.query("Blockchain == @i")['Volume'],
-                    mode='lines',
-                    stackgroup='one',
-                    groupnorm='percent'
+            st.subheader('Sales Over Time')
+            df = select(rolled_up(nfts_daily), options)
+            c1, c2 = st.columns(2)
+            with c1:
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='Volume', color='Blockchain', title='Daily Sales Volume', log_y=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='Sales', color='Blockchain', title='Daily Sales', log_y=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
                 ))
-            fig.update_layout(title='Daily Share of Sales Volume')
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
             
-            fig = go.Figure()
-            for i in options:
-                fig.add_trace(go.Scatter(
-                    name=i,
-                    x=df.query("Blockchain == @i")['Date'],
-                    y=df.query("Blockchain == @i")['Sales'],
-                    mode='lines',
-                    stackgroup='one',
-                    groupnorm='percent'
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='Buyers', color='Blockchain', title='Daily Buyers', log_y=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
                 ))
-            fig.update_layout(title='Daily Share of Sales')
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
             
-            fig = go.Figure()
-            for i in options:
-                fig.add_trace(go.Scatter(
-                    name=i,
-                    x=df.query("Blockchain == @i")['Date'],
-                    y=df.query("Blockchain == @i")['Buyers'],
-                    mode='lines',
-                    stackgroup='one',
-                    groupnorm='percent'
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='NFTs', color='Blockchain', title='Daily Traded NFTs', log_y=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
                 ))
-            fig.update_layout(title='Daily Share of Buyers')
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
             
-            fig = go.Figure()
-            for i in options:
-                fig.add_trace(go.Scatter(
-                    name=i,
-                    x=df.query("Blockchain == @i")['Date'],
-                    y=df.query("Blockchain == @i")['NFTs'],
-                    mode='lines',
-                    stackgroup='one',
-                    groupnorm='percent'
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='Collections', color='Blockchain', title='Daily Traded Collections', log_y=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
                 ))
-            fig.update_layout(title='Daily Share of Traded NFTs')
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
+            with c2:
+                df_shares = cube(rolled_up(nfts_daily)).shares(options, ['Volume', 'Sales', 'Buyers', 'NFTs', 'Collections'])
+
+                fig = cached_figure(options, lambda: share_chart(df_shares['Volume'], 'Daily Share of Sales Volume'))
+                st.plotly_chart(fig, use_container_width=True)
+            
+                fig = cached_figure(options, lambda: share_chart(df_shares['Sales'], 'Daily Share of Sales'))
+                st.plotly_chart(fig, use_container_width=True)
+            
+                fig = cached_figure(options, lambda: share_chart(df_shares['Buyers'], 'Daily Share of Buyers'))
+                st.plotly_chart(fig, use_container_width=True)
+            
+                fig = cached_figure(options, lambda: share_chart(df_shares['NFTs'], 'Daily Share of Traded NFTs'))
+                st.plotly_chart(fig, use_container_width=True)
             
-            fig = go.Figure()
-            for i in options:
-                fig.add_trace(go.Scatter(
-                    name=i,
-                    x=df.query("Blockchain == @i")['Date'],
-                    y=df.query("Blockchain == @i")['Collections'],
-                    mode='lines',
-                    stackgroup='one',
-                    groupnorm='percent'
+                fig = cached_figure(options, lambda: share_chart(df_shares['Collections'], 'Daily Share of Traded Collections'))
+                st.plotly_chart(fig, use_container_width=True)
+
+    if subtab_prices.open:
+        with subtab_prices:
+            st.subheader('NFT Prices')
+            c1, c2 = st.columns([1, 2])
+            with c1:
+                df = select(nfts_overview, options)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='PriceAverage', color='Blockchain', title='Average NFT Price', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
                 ))
-            fig.update_layout(title='Daily Share of Traded Collections')
-            st.plotly_chart(fig, use_container_width=True)
-
-    with subtab_prices:
-        st.subheader('NFT Prices')
-        c1, c2 = st.columns([1, 2])
-        with c1:
-            df = nfts_overview.query('Blockchain == @options')
-
-            fig = px.bar(df, x='Blockchain', y='PriceAverage', color='Blockchain', title='Average NFT Price', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='PriceMedian', color='Blockchain', title='Median NFT Price', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.bar(df, x='Blockchain', y='PriceMax', color='Blockchain', title='Maximum NFT Price', log_y=True)
-            fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
-            st.plotly_chart(fig, use_container_width=True)
-        with c2:
-            df = nfts_daily.query('Blockchain == @options')
-
-            fig = px.line(df, x='Date', y='PriceAverage', color='Blockchain', title='Daily Average NFT Price', log_y=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.line(df, x='Date', y='PriceMedian', color='Blockchain', title='Daily Median NFT Price', log_y=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.line(df, x='Date', y='PriceMax', color='Blockchain', title='Daily Maximum NFT Price', log_y=True)
-            fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='PriceMedian', color='Blockchain', title='Median NFT Price', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.bar(df, x='Blockchain', y='PriceMax', color='Blockchain', title='Maximum NFT Price', log_y=True)
+                    .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'total ascending'})
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+            with c2:
+                df = select(rolled_up(nfts_daily), options)
+
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='PriceAverage', color='Blockchain', title='Daily Average NFT Price', log_y=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='PriceMedian', color='Blockchain', title='Daily Median NFT Price', log_y=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.line(df, x='Date', y='PriceMax', color='Blockchain', title='Daily Maximum NFT Price', log_y=True)
+                    .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+                ))
+                st.plotly_chart(fig, use_container_width=True)
     
-    with subtab_heatmap:
-        st.subheader('Heatmap of Sales')
-        df = nfts_heatmap.query('Blockchain == @options')
-        c1, c2 = st.columns(2)
-        with c1:
-            fig = px.scatter(df, x='Volume', y='Day', color='Blockchain', title='Daily Heatmap of Sales Volume', log_x=True)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='Sales', y='Day', color='Blockchain', title='Daily Heatmap of Sales', log_x=True)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='Buyers', y='Day', color='Blockchain', title='Daily Heatmap of Buyers', log_x=True)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='PriceAverage', y='Day', color='Blockchain', title='Daily Heatmap of Average NFT Price', log_x=True)
-            fig.update_layout(xaxis_title='Average Price')
-            st.plotly_chart(fig, use_container_width=True)
-        with c2:
-            fig = px.scatter(df, x='Volume', y='Hour', color='Blockchain', title='Hourly Heatmap of Sales Volume', log_x=True)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='Sales', y='Hour', color='Blockchain', title='Hourly Heatmap of Sales', log_x=True)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='Buyers', y='Hour', color='Blockchain', title='Hourly Heatmap of Buyers', log_x=True)
-            st.plotly_chart(fig, use_container_width=True)
-
-            fig = px.scatter(df, x='PriceAverage', y='Hour', color='Blockchain', title='Hourly Heatmap of Average NFT Price', log_x=True)
-            fig.update_layout(xaxis_title='Average Price')
-            st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    if subtab_heatmap.open:
+        with subtab_heatmap:
+            st.subheader('Heatmap of Sales')
+            df = select(nfts_heatmap, options)
+            c1, c2 = st.columns(2)
+            with c1:
+                fig = cached_figure(options, lambda: px.scatter(df, x='Volume', y='Day', color='Blockchain', title='Daily Heatmap of Sales Volume', log_x=True))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: px.scatter(df, x='Sales', y='Day', color='Blockchain', title='Daily Heatmap of Sales', log_x=True))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: px.scatter(df, x='Buyers', y='Day', color='Blockchain', title='Daily Heatmap of Buyers', log_x=True))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.scatter(df, x='PriceAverage', y='Day', color='Blockchain', title='Daily Heatmap of Average NFT Price', log_x=True)
+                    .update_layout(xaxis_title='Average Price')
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+            with c2:
+                fig = cached_figure(options, lambda: px.scatter(df, x='Volume', y='Hour', color='Blockchain', title='Hourly Heatmap of Sales Volume', log_x=True))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: px.scatter(df, x='Sales', y='Hour', color='Blockchain', title='Hourly Heatmap of Sales', log_x=True))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: px.scatter(df, x='Buyers', y='Hour', color='Blockchain', title='Hourly Heatmap of Buyers', log_x=True))
+                st.plotly_chart(fig, use_container_width=True)
+
+                fig = cached_figure(options, lambda: (
+                    px.scatter(df, x='PriceAverage', y='Hour', color='Blockchain', title='Hourly Heatmap of Average NFT Price', log_x=True)
+                    .update_layout(xaxis_title='Average Price')
+                ))
+                st.plotly_chart(fig, use_container_width=True)
+
+# Timings
+debug_sidebar(__file__)
\ No newline at end of file
@@ -1,8 +1,14 @@
 # Libraries
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from monitoring.charts import cached_figure, share_chart
+from monitoring.data import load_data
+from monitoring.debug import debug_sidebar
+from monitoring.index import select, top
+from monitoring.lazy import lazy_import
+from monitoring.rollups import rolled_up
+from monitoring.transforms import shares
+
+px = lazy_import('plotly.express')
 
 # Layout
 st.set_page_config(page_title='NFT Marketplaces - Cross Chain Monitoring', page_icon=':bar_chart:', layout='wide')
@@ -13,26 +19,11 @@ with open('style.css')as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html = True)
 
 # Data Sources
-@st.cache(ttl=600)
-def get_data(data_sector, data_type):
-    if data_sector == 'NFTs':
-        if data_type == 'Overview':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/a9dee9b9-bfd8-4fed-b49b-a03767306d89/data/latest')
-        elif data_type == 'Daily':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/6ec4aca1-3d25-4233-bec2-0443b27d3e6c/data/latest')
-        elif data_type == 'Heatmap':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/62fa2182-ca1b-4648-a363-8d1ce591253e/data/latest')
-        elif data_type == 'Marketplaces Overview':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/8f4e8520-52af-4d57-b29e-e513f62f8fa9/data/latest')
-        elif data_type == 'Marketplaces Daily':
-            return pd.read_json('https://node-api.flipsidecrypto.com/api/v2/queries/8fcca211-4bc6-444d-8696-0a583e2966a6/data/latest')
-    return None
-
-nfts_overview = get_data('NFTs', 'Overview')
-nfts_daily = get_data('NFTs', 'Daily')
-nfts_heatmap = get_data('NFTs', 'Heatmap')
-nfts_marketplaces_overview = get_data('NFTs', 'Marketplaces Overview')
-nfts_marketplaces_daily = get_data('NFTs', 'Marketplaces Daily')
+nfts_overview, nfts_marketplaces_overview, nfts_marketplaces_daily = load_data(
+    ('NFTs', 'Overview'),
+    ('NFTs', 'Marketplaces Overview'),
+    ('NFTs', 'Marketplaces Daily'),
+)
 
 # Filter the blockchains
 options = st.multiselect(
@@ -51,175 +42,180 @@ elif len(options) == 1:
     st.subheader('Overview')
     c1, c2 = st.columns([1, 2])
     with c1:
-        df = nfts_marketplaces_overview.query('Blockchain == @options')
+        df = select(nfts_marketplaces_overview, options)
 
-        fig = px.histogram(df, x='Marketplace', y='Volume', color='Marketplace', title='Sales Volume of Each Marketplace', log_y=True)
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-        fig.update_xaxes(categoryorder='total ascending')
+        fig = cached_figure(options, lambda: (
+            px.histogram(df, x='Marketplace', y='Volume', color='Marketplace', title='Sales Volume of Each Marketplace', log_y=True)
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+            .update_xaxes(categoryorder='total ascending')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.histogram(df, x='Marketplace', y='Sales', color='Marketplace', title='Sales of Each Marketplace', log_y=True)
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-        fig.update_xaxes(categoryorder='total ascending')
+        fig = cached_figure(options, lambda: (
+            px.histogram(df, x='Marketplace', y='Sales', color='Marketplace', title='Sales of Each Marketplace', log_y=True)
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+            .update_xaxes(categoryorder='total ascending')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.histogram(df, x='Marketplace', y='Buyers', color='Marketplace', title='Buyers of Each Marketplace', log_y=True)
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-        fig.update_xaxes(categoryorder='total ascending')
+        fig = cached_figure(options, lambda: (
+            px.histogram(df, x='Marketplace', y='Buyers', color='Marketplace', title='Buyers of Each Marketplace', log_y=True)
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+            .update_xaxes(categoryorder='total ascending')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.histogram(df, x='Marketplace', y='NFTs', color='Marketplace', title='Traded NFTs of Each Marketplace', log_y=True)
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-        fig.update_xaxes(categoryorder='total ascending')
+        fig = cached_figure(options, lambda: (
+            px.histogram(df, x='Marketplace', y='NFTs', color='Marketplace', title='Traded NFTs of Each Marketplace', log_y=True)
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+            .update_xaxes(categoryorder='total ascending')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
     with c2:
-        df = nfts_marketplaces_daily.query('Blockchain == @options')
+        df = select(rolled_up(nfts_marketplaces_daily), options)
 
-        fig = px.line(df, x='Date', y='Volume', color='Marketplace', title='Daily Sales Volume of Each Marketplace', log_y=True)
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: (
+            px.line(df, x='Date', y='Volume', color='Marketplace', title='Daily Sales Volume of Each Marketplace', log_y=True)
+            .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        ))
         st.plotly_chart(fig, use_container_width=True)
         
-        fig = px.line(df, x='Date', y='Sales', color='Marketplace', title='Daily Sales of Each Marketplace', log_y=True)
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: (
+            px.line(df, x='Date', y='Sales', color='Marketplace', title='Daily Sales of Each Marketplace', log_y=True)
+            .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        ))
         st.plotly_chart(fig, use_container_width=True)
         
-        fig = px.line(df, x='Date', y='Buyers', color='Marketplace', title='Daily Buyers of Each Marketplace', log_y=True)
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: (
+            px.line(df, x='Date', y='Buyers', color='Marketplace', title='Daily Buyers of Each Marketplace', log_y=True)
+            .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        ))
         st.plotly_chart(fig, use_container_width=True)
         
-        fig = px.line(df, x='Date', y='NFTs', color='Marketplace', title='Daily Traded NFTs of Each Marketplace', log_y=True)
-        fig.update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        fig = cached_figure(options, lambda: (
+            px.line(df, x='Date', y='NFTs', color='Marketplace', title='Daily Traded NFTs of Each Marketplace', log_y=True)
+            .update_layout(legend_title=None, xaxis_title=None, yaxis_title=None)
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
     st.subheader('Market Shares')
     c1, c2 = st.columns([1, 2])
     with c1:
-        df = nfts_marketplaces_overview.query('Blockchain == @options')
+        df = select(nfts_marketplaces_overview, options)
 
-        fig = px.pie(df, values='Volume', names='Marketplace', title='Share of Sales Volume of Each Marketplace')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Volume', names='Marketplace', title='Share of Sales Volume of Each Marketplace')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.pie(df, values='Sales', names='Marketplace', title='Share of Sales of Each Marketplace')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Sales', names='Marketplace', title='Share of Sales of Each Marketplace')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.pie(df, values='Buyers', names='Marketplace', title='Share of Buyers of Each Marketplace')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Buyers', names='Marketplace', title='Share of Buyers of Each Marketplace')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
-        fig = px.pie(df, values='NFTs', names='Marketplace', title='Share of Traded NFTs of Each Marketplace')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='NFTs', names='Marketplace', title='Share of Traded NFTs of Each Marketplace')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
     with c2:
-        df = nfts_marketplaces_daily.query('Blockchain == @options')
-
-        fig = go.Figure()
-        for i in df['Marketplace'].unique():
-            fig.add_trace(go.Scatter(
-                name=i,
-                x=df.query("Marketplace == @i")['Date'],
-                y=df.query("Marketplace == @i")['Volume'],
-                mode='lines',
-                stackgroup='one',
-                groupnorm='percent'
-            ))
-        fig.update_layout(title='Daily Share of Sales Volume of Each Marketplace')
-        st.plotly_chart(fig, use_container_width=True)
-
-        fig = go.Figure()
-        for i in df['Marketplace'].unique():
-            fig.add_trace(go.Scatter(
-                name=i,
-                x=df.query("Marketplace == @i")['Date'],
-                y=df.query("Marketplace == @i")['Sales'],
-                mode='lines',
-                stackgroup='one',
-                groupnorm='percent'
-            ))
-        fig.update_layout(title='Daily Share of Sales of Each Marketplace')
-        st.plotly_chart(fig, use_container_width=True)
-
-        fig = go.Figure()
-        for i in df['Marketplace'].unique():
-            fig.add_trace(go.Scatter(
-                name=i,
-                x=df.query("Marketplace == @i")['Date'],
-                y=df.query("Marketplace == @i")['Buyers'],
-                mode='lines',
-                stackgroup='one',
-                groupnorm='percent'
-            ))
-        fig.update_layout(title='Daily Share of Buyers of Each Marketplace')
-        st.plotly_chart(fig, use_container_width=True)
-
-        fig = go.Figure()
-        for i in df['Marketplace'].unique():
-            fig.add_trace(go.Scatter(
-                name=i,
-                x=df.query("Marketplace == @i")['Date'],
-                y=df.query("Marketplace == @i")['NFTs'],
-                mode='lines',
-                stackgroup='one',
-                groupnorm='percent'
-            ))
-        fig.update_layout(title='Daily Share of Traded NFTs of Each Marketplace')
+        df = select(rolled_up(nfts_marketplaces_daily), options)
+
+        df_shares = shares(df, 'Date', 'Marketplace', ['Volume', 'Sales', 'Buyers', 'NFTs'])
+
+        fig = cached_figure(options, lambda: share_chart(df_shares['Volume'], 'Daily Share of Sales Volume of Each Marketplace'))
+        st.plotly_chart(fig, use_container_width=True)
+
+        fig = cached_figure(options, lambda: share_chart(df_shares['Sales'], 'Daily Share of Sales of Each Marketplace'))
+        st.plotly_chart(fig, use_container_width=True)
+
+        fig = cached_figure(options, lambda: share_chart(df_shares['Buyers'], 'Daily Share of Buyers of Each Marketplace'))
+        st.plotly_chart(fig, use_container_width=True)
+
+        fig = cached_figure(options, lambda: share_chart(df_shares['NFTs'], 'Daily Share of Traded NFTs of Each Marketplace'))
         st.plotly_chart(fig, use_container_width=True)
 
 # Cross Chain Comparison
 else:
     st.subheader('Overview')
-    df = nfts_marketplaces_overview.query('Blockchain == @options')
+    df = select(nfts_marketplaces_overview, options)
     c1, c2, c3, c4 = st.columns(4)
     with c1:
-        fig = px.histogram(df.sort_values('Volume', ascending=False).head(20), x='Marketplace', y='Volume', color='Blockchain', title='Sales Volume of Top marketplaces', log_y=True)
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-        fig.update_xaxes(categoryorder='total ascending')
+        fig = cached_figure(options, lambda: (
+            px.histogram(top(nfts_marketplaces_overview, options, 'Volume'), x='Marketplace', y='Volume', color='Blockchain', title='Sales Volume of Top marketplaces', log_y=True)
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+            .update_xaxes(categoryorder='total ascending')
+        ))
         st.plotly_chart(fig, use_container_width=True)
     with c2:
-        fig = px.histogram(df.sort_values('Sales', ascending=False).head(20), x='Marketplace', y='Sales', color='Blockchain', title='Sales of Top Marketplace', log_y=True)
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-        fig.update_xaxes(categoryorder='total ascending')
+        fig = cached_figure(options, lambda: (
+            px.histogram(top(nfts_marketplaces_overview, options, 'Sales'), x='Marketplace', y='Sales', color='Blockchain', title='Sales of Top Marketplace', log_y=True)
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+            .update_xaxes(categoryorder='total ascending')
+        ))
         st.plotly_chart(fig, use_container_width=True)
     with c3:
-        fig = px.histogram(df.sort_values('Buyers', ascending=False).head(20), x='Marketplace', y='Buyers', color='Blockchain', title='Buyers of Top Marketplace', log_y=True)
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-        fig.update_xaxes(categoryorder='total ascending')
+        fig = cached_figure(options, lambda: (
+            px.histogram(top(nfts_marketplaces_overview, options, 'Buyers'), x='Marketplace', y='Buyers', color='Blockchain', title='Buyers of Top Marketplace', log_y=True)
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+            .update_xaxes(categoryorder='total ascending')
+        ))
         st.plotly_chart(fig, use_container_width=True)
     with c4:
-        fig = px.histogram(df.sort_values('NFTs', ascending=False).head(20), x='Marketplace', y='NFTs', color='Blockchain', title='Traded NFTs of Top Marketplace', log_y=True)
-        fig.update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
-        fig.update_xaxes(categoryorder='total ascending')
+        fig = cached_figure(options, lambda: (
+            px.histogram(top(nfts_marketplaces_overview, options, 'NFTs'), x='Marketplace', y='NFTs', color='Blockchain', title='Traded NFTs of Top Marketplace', log_y=True)
+            .update_layout(showlegend=False, xaxis_title=None, yaxis_title=None, xaxis={'categoryorder':'category ascending'})
+            .update_xaxes(categoryorder='total ascending')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
     st.subheader('Market Shares')
     c1, c2, c3, c4 = st.columns(4)
     with c1:
-        fig = px.pie(df, values='Volume', names='Marketplace', title='Share of Sales Volume of Top Marketplace')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Volume', names='Marketplace', title='Share of Sales Volume of Top Marketplace')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
     with c2:
-        fig = px.pie(df, values='Sales', names='Marketplace', title='Share of Sales of Top Marketplace')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Sales', names='Marketplace', title='Share of Sales of Top Marketplace')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
     with c3:
-        fig = px.pie(df, values='Buyers', names='Marketplace', title='Share of Buyers of Top Marketplace')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='Buyers', names='Marketplace', title='Share of Buyers of Top Marketplace')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
         st.plotly_chart(fig, use_container_width=True)
     
     with c4:
-        fig = px.pie(df, values='NFTs', names='Marketplace', title='Share of Traded NFTs of Top Marketplace')
-        fig.update_layout(showlegend=False)
-        fig.update_traces(textinfo='percent+label', textposition='inside')
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        fig = cached_figure(options, lambda: (
+            px.pie(df, values='NFTs', names='Marketplace', title='Share of Traded NFTs of Top Marketplace')
+            .update_layout(showlegend=False)
+            .update_traces(textinfo='percent+label', textposition='inside')
+        ))
+        st.plotly_chart(fig, use_container_width=True)
+
+# Timings
+debug_sidebar(__file__)
\ No newline at end of file
@@ -0,0 +1,39 @@
+# Libraries
+import pandas as pd
+
+from monitoring.history import rollup
+
+
+def test_rollup_keeps_ratios_of_distinct_counts():
+    # 39 days of history, while the latest query covers 13 of them with 7629 distinct users
+    daily = pd.DataFrame({
+        'Blockchain': 'Ethereum',
+        'Date': pd.date_range('2022-11-06', periods=39),
+        'Transfers': 100,
+        'Users': 50,
+        'Volume': 1000.0
+    })
+    overview = pd.DataFrame({
+        'Blockchain': ['Ethereum'],
+        'Days': [13],
+        'Transfers': [1300],
+        'Users': [7629],
+        'Volume': [13000.0],
+        'AmountAverage': [10.0],
+        'Volume/Day': [1000.0],
+        'Users/Day': [586.8],
+        'Transfers/User': [0.17]
+    })
+
+    data = rollup(daily, overview).iloc[0]
+
+    # Totals and the ratios of two of them cover the whole history
+    assert data['Days'] == 39
+    assert data['Transfers'] == 3900
+    assert data['Volume'] == 39000
+    assert data['AmountAverage'] == 10
+    assert data['Volume/Day'] == 1000
+    # The distinct count and the ratios involving it keep the values of the latest query
+    assert data['Users'] == 7629
+    assert data['Users/Day'] == 586.8
+    assert data['Transfers/User'] == 0.17
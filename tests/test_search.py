@@ -0,0 +1,20 @@
+# Libraries
+import numpy as np
+import pandas as pd
+import pytest
+
+from monitoring.search import search
+
+
+@pytest.mark.parametrize('ascending', [False, True])
+def test_search_orders_ties_like_a_stable_sort(ascending):
+    data = pd.DataFrame({
+        'Blockchain': ['Ethereum', 'Solana', 'Ethereum', 'Ethereum', 'Solana', 'Ethereum'],
+        'Collection': ['A', 'B', 'C', 'D', 'E', 'F'],
+        'Volume': [2.0, 1.0, np.nan, 2.0, 1.0, 1.0]
+    })
+
+    rows = search(data, ['Ethereum', 'Solana'], 'Volume', ascending)
+
+    expected = data.sort_values('Volume', ascending=ascending, kind='stable')
+    assert list(data['Collection'].take(rows)) == list(expected['Collection'])